@@ -48,7 +48,7 @@ echo "==========================================="
 echo "Job: test-backend"
 echo "==========================================="
 run_job "Backend - Install" "cd fib-be && pip install -q -r requirements.txt"
-run_job "Backend - Tests" "cd fib-be && python -m pytest test_main.py -v --tb=short"
+run_job "Backend - Tests" "cd fib-be && python -m pytest -v --tb=short"
 
 # Worker Job
 echo "==========================================="
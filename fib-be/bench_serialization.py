@@ -0,0 +1,59 @@
+"""Compare the old and new encoding paths for /values/current.
+
+Only the Python side is measured; Redis is not involved. /values/all is left
+out: its JSON is now built by json_agg inside Postgres, so a Python-only
+timing would not show what it costs.
+
+    python bench_serialization.py [sizes...]
+"""
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from fibtable import FibTable
+from responses import encode_response
+
+MSGPACK = "application/msgpack"
+
+
+def best_of(fn, repeat=5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def old_current(keys, values):
+    result = {}
+    for key, value in zip(keys, values):
+        index = key.split(".")[-1]
+        result[index] = value
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def new_current(keys, values, accept=""):
+    skip = len("values.")
+    return encode_response(dict(zip([key[skip:] for key in keys], values)), accept).body
+
+
+def main(sizes):
+    table = FibTable(1000)
+    print(f"{'endpoint':<16}{'rows':>10}{'old ms':>10}{'json ms':>10}{'msgpack ms':>12}{'speedup':>9}")
+    for size in sizes:
+        keys = [f"values.{n}" for n in range(size)]
+        # Realistic mix of short and long values
+        values = [str(table.get(n % 1000), "ascii") for n in range(size)]
+
+        old = best_of(lambda: old_current(keys, values))
+        new = best_of(lambda: new_current(keys, values))
+        packed = best_of(lambda: new_current(keys, values, MSGPACK))
+        print(f"{'/values/current':<16}{size:>10}{old * 1e3:>10.1f}{new * 1e3:>10.1f}"
+              f"{packed * 1e3:>12.1f}{old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,381 @@
+"""Streaming bulk export and import of indices and computed values.
+
+Export first writes the definitions of custom sequences, then streams
+`indices` out of Postgres with COPY and joins each batch with its values from
+Redis (falling back to the cold store). Import loads indices
+back with COPY into a temporary table and writes values with pipelined SETs.
+Both directions work batch by batch, so memory use does not grow with the
+number of rows.
+
+Also usable from the command line:
+
+    python bulk.py export --format ndjson --output dump.ndjson
+    python bulk.py import dump.ndjson --format ndjson
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+
+from recurrence import LinearRecurrence, custom, value_key
+
+
+FORMATS = ("ndjson", "csv")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+CSV_HEADER = b"sequence,index,value\n"
+
+_INDEX = re.compile(r"[0-9]+")
+_VALUE = re.compile(r"-?[0-9]+")
+
+
+class InvalidRow(ValueError):
+    """An import row that is malformed or out of range."""
+
+    def __init__(self, line: int, reason: str):
+        super().__init__(f"line {line}: {reason}")
+        self.line = line
+
+
+class TransferStats:
+    """Row count and throughput of one export or import."""
+
+    def __init__(self):
+        self.rows = 0
+        self.started = time.monotonic()
+        self.finished = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+async def iter_lines(chunks):
+    """Split an async stream of byte chunks into lines without the newline."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def format_row(fmt: str, sequence: str, index: int, value: str | None) -> bytes:
+    if fmt == "csv":
+        return f"{sequence},{index},{value if value is not None else ''}\n".encode()
+    return json.dumps({"sequence": sequence, "index": index, "value": value}).encode() + b"\n"
+
+
+def format_definition(fmt: str, recurrence: LinearRecurrence) -> bytes:
+    """A custom sequence's definition row; CSV packs it as `<name>,definition,<c1 c2..>;<a0 a1..>`."""
+    if fmt == "csv":
+        coefficients = " ".join(map(str, recurrence.coefficients))
+        initial = " ".join(map(str, recurrence.initial))
+        return f"{recurrence.name},definition,{coefficients};{initial}\n".encode()
+    return json.dumps({
+        "sequence": recurrence.name,
+        "coefficients": recurrence.coefficients,
+        "initial": recurrence.initial,
+    }).encode() + b"\n"
+
+
+def _parse_definition(sequence, coefficients, initial) -> LinearRecurrence:
+    if not isinstance(coefficients, list) or not isinstance(initial, list) or not all(
+        isinstance(n, int) and not isinstance(n, bool) for n in coefficients + initial
+    ):
+        raise ValueError("coefficients and initial must be lists of integers")
+    recurrence = custom(coefficients, initial)
+    if recurrence.name != sequence:
+        raise ValueError(f"definition does not match sequence {sequence}")
+    return recurrence
+
+
+def parse_row(fmt: str, line: bytes) -> tuple[str, int, str | None] | LinearRecurrence | None:
+    """Parse one import line; returns None for blank lines and the CSV header.
+
+    Definition rows of custom sequences come back as a LinearRecurrence.
+    Rows without a sequence (two-column CSV, NDJSON without the field) are fib.
+    Raises ValueError for a malformed row: a wrong shape, a negative or
+    non-integer index, a value that is not a decimal integer, or a definition
+    that does not hash to its name.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if fmt == "csv":
+        fields = line.decode().split(",")
+        if fields[0] in ("sequence", "index"):
+            return None
+        if len(fields) == 2:
+            fields.insert(0, "fib")
+        if len(fields) != 3:
+            raise ValueError("expected sequence,index,value")
+        sequence, index, value = fields
+        if index == "definition":
+            coefficients, _, initial = value.partition(";")
+            try:
+                return _parse_definition(sequence, [int(c) for c in coefficients.split()],
+                                         [int(a) for a in initial.split()])
+            except ValueError as e:
+                raise ValueError(f"invalid definition: {e}") from None
+        value = value or None
+    else:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("expected a JSON object")
+        if "coefficients" in row:
+            return _parse_definition(row.get("sequence"), row["coefficients"], row.get("initial"))
+        sequence, index, value = row.get("sequence", "fib"), row.get("index"), row.get("value")
+        if isinstance(index, int) and not isinstance(index, bool):
+            index = str(index)
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = str(value)
+
+    if not isinstance(sequence, str) or not sequence:
+        raise ValueError("sequence must be a non-empty string")
+    if not isinstance(index, str) or not _INDEX.fullmatch(index):
+        raise ValueError("index must be a non-negative integer")
+    if value is not None and (not isinstance(value, str) or not _VALUE.fullmatch(value)):
+        raise ValueError("value must be a decimal integer")
+    return sequence, int(index), value
+
+
+async def export_rows(pg_pool, redis_client, cold_store=None, fmt: str = "ndjson",
+                      batch_size: int = 1000, stats: TransferStats = None):
+    """Yield custom sequence definitions, then every index and its value (or null)."""
+    stats = stats or TransferStats()
+    async with pg_pool.acquire() as conn:
+        definitions = await conn.fetch("SELECT name, coefficients, initial FROM sequences ORDER BY name")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+
+    async def copy_indices():
+        async def output(chunk):
+            await queue.put(chunk)
+
+        try:
+            async with pg_pool.acquire() as conn:
+                await conn.copy_from_query(
+                    "SELECT sequence, number FROM indices ORDER BY sequence, number",
+                    output=output, format="csv"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    async def copied_chunks():
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+
+    producer = asyncio.create_task(copy_indices())
+    try:
+        if fmt == "csv":
+            yield CSV_HEADER
+        # Before the values, so an import registers each sequence before its rows
+        if definitions:
+            yield b"".join(
+                format_definition(fmt, LinearRecurrence(
+                    row["name"], json.loads(row["coefficients"]), json.loads(row["initial"])
+                ))
+                for row in definitions
+            )
+
+        batch = []
+        async for line in iter_lines(copied_chunks()):
+            if line:
+                sequence, _, index = line.decode().partition(",")
+                batch.append((sequence, int(index)))
+            if len(batch) >= batch_size:
+                yield await _export_batch(redis_client, cold_store, fmt, batch)
+                stats.rows += len(batch)
+                batch = []
+        if batch:
+            yield await _export_batch(redis_client, cold_store, fmt, batch)
+            stats.rows += len(batch)
+
+        # Surface COPY errors instead of ending the stream silently
+        await producer
+        stats.finished = time.monotonic()
+        print(f"✓ Exported {stats.rows} rows in {stats.seconds:.1f}s "
+              f"({stats.rows_per_second:.0f} rows/s)", file=sys.stderr)
+    finally:
+        producer.cancel()
+
+
+async def _export_batch(redis_client, cold_store, fmt, rows) -> bytes:
+    keys = [value_key(sequence, index) for sequence, index in rows]
+    values = await redis_client.mget(keys)
+
+    out = bytearray()
+    for (sequence, index), key, value in zip(rows, keys, values):
+        if value is None and cold_store is not None:
+            view = cold_store.get(key)
+            if view is not None:
+                value = str(view, "ascii")
+        out += format_row(fmt, sequence, index, value)
+    return bytes(out)
+
+
+async def import_rows(pg_pool, redis_client, chunks, get_recurrence, max_index,
+                      fmt: str = "ndjson", batch_size: int = 1000) -> TransferStats:
+    """Bulk-load indices and values from an async stream of NDJSON or CSV chunks.
+
+    Every row is checked like `POST /values`: the sequence must be known to
+    `get_recurrence` (or defined earlier in the stream) and the index at most
+    `max_index(sequence)`. The first bad row raises InvalidRow; batches before
+    it stay imported. Definition rows are registered in `sequences`.
+
+    Fib rows without a value are published on `insert` so the worker computes
+    them; the reconciler picks up missing values of other sequences.
+    """
+    stats = TransferStats()
+    known: set[str] = set()
+    async with pg_pool.acquire() as conn:
+        await conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS indices_import (number INTEGER, sequence TEXT)"
+        )
+        try:
+            batch = []
+            line_number = 0
+            async for line in iter_lines(chunks):
+                line_number += 1
+                row = await _check_row(fmt, line, line_number, get_recurrence, max_index, known)
+                if isinstance(row, LinearRecurrence):
+                    await conn.execute(
+                        "INSERT INTO sequences (name, coefficients, initial) VALUES ($1, $2, $3) "
+                        "ON CONFLICT DO NOTHING",
+                        row.name, json.dumps(row.coefficients), json.dumps(row.initial)
+                    )
+                    known.add(row.name)
+                elif row is not None:
+                    batch.append(row)
+                if len(batch) >= batch_size:
+                    await _import_batch(conn, redis_client, batch)
+                    stats.rows += len(batch)
+                    batch = []
+            if batch:
+                await _import_batch(conn, redis_client, batch)
+                stats.rows += len(batch)
+        finally:
+            await conn.execute("DROP TABLE IF EXISTS indices_import")
+            # Tell every API process to drop its cached listings, also after a partial import
+            await redis_client.publish("computed", "*")
+
+    stats.finished = time.monotonic()
+    print(f"✓ Imported {stats.rows} rows in {stats.seconds:.1f}s "
+          f"({stats.rows_per_second:.0f} rows/s)", file=sys.stderr)
+    return stats
+
+
+async def _check_row(fmt, line, line_number, get_recurrence, max_index, known):
+    try:
+        row = parse_row(fmt, line)
+    except ValueError as e:
+        raise InvalidRow(line_number, str(e)) from None
+    if row is None or isinstance(row, LinearRecurrence):
+        return row
+
+    sequence, index, _ = row
+    if sequence not in known:
+        if await get_recurrence(sequence) is None:
+            raise InvalidRow(line_number, f"unknown sequence {sequence}")
+        known.add(sequence)
+    if index > max_index(sequence):
+        raise InvalidRow(line_number, f"index too high (max {max_index(sequence)})")
+    return row
+
+
+async def _import_batch(conn, redis_client, rows):
+    async with conn.transaction():
+        await conn.copy_records_to_table(
+            "indices_import", records=[(index, sequence) for sequence, index, _ in rows],
+            columns=["number", "sequence"]
+        )
+        await conn.execute(
+            "INSERT INTO indices (number, sequence) SELECT number, sequence FROM indices_import "
+            "ON CONFLICT DO NOTHING"
+        )
+        await conn.execute("TRUNCATE indices_import")
+
+    pipe = redis_client.pipeline(transaction=False)
+    for sequence, index, value in rows:
+        if value is not None:
+            pipe.set(value_key(sequence, index), value)
+        elif sequence == "fib":
+            pipe.publish("insert", str(index))
+    await pipe.execute()
+
+
+async def _file_chunks(path: str, chunk_size: int = 64 * 1024):
+    f = open(path, "rb") if path != "-" else sys.stdin.buffer
+    try:
+        while chunk := f.read(chunk_size):
+            yield chunk
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+async def _cli(argv=None):
+    import argparse
+
+    import asyncpg
+    import redis.asyncio as redis
+
+    import main
+    from storage import ColdStore
+
+    parser = argparse.ArgumentParser(description="Bulk export/import of indices and values")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export", help="Write all indices and values")
+    export_parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    export_parser.add_argument("--output", default="-", help="File path, or - for stdout")
+    import_parser = sub.add_parser("import", help="Load indices and values")
+    import_parser.add_argument("input", help="File path, or - for stdin")
+    import_parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    for p in (export_parser, import_parser):
+        p.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    redis_client = redis.from_url(f"redis://{main.REDIS_HOST}:{main.REDIS_PORT}", decode_responses=True)
+    pg_pool = await asyncpg.create_pool(**main.postgres_params())
+    cold_store = ColdStore(main.COLD_STORE_DIR) if main.COLD_STORE_DIR else None
+    try:
+        if args.command == "export":
+            out = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+            try:
+                async for chunk in export_rows(pg_pool, redis_client, cold_store,
+                                               args.format, args.batch_size):
+                    out.write(chunk)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+        else:
+            main.pg_pool = pg_pool  # for main.get_recurrence
+            await import_rows(pg_pool, redis_client, _file_chunks(args.input),
+                              main.get_recurrence, main.max_index, args.format, args.batch_size)
+    finally:
+        if cold_store is not None:
+            cold_store.close()
+        await redis_client.close()
+        await pg_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_cli())
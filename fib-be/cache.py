@@ -0,0 +1,106 @@
+"""In-process cache of computed values and encoded listings.
+
+Computed values never change once written, so they are cached until evicted.
+Listing snapshots (encoded `/values/all` and `/values/current` bodies) change
+whenever an index is added or a value computed. They are tagged with a group
+so a pub/sub notification can drop them without scanning the whole cache.
+They also carry a max age, because pub/sub can lose messages. The cache is
+bounded by the total size of the stored bytes; least recently used entries go
+first.
+"""
+import time
+from collections import OrderedDict
+
+
+class ByteLRU:
+    """LRU cache of bytes values, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int, max_item_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes if max_item_bytes is not None else max_bytes // 16
+        self._entries: OrderedDict[str, tuple[bytes, float | None, str | None]] = OrderedDict()
+        self._groups: dict[str, set[str]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Bumped on every invalidation; lets callers detect one that happened while they built a snapshot
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires, _ = entry
+        if expires is not None and expires <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: bytes, max_age: float | None = None, group: str | None = None):
+        """Store a value; values larger than max_item_bytes are not cached."""
+        if len(value) > self.max_item_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        expires = time.monotonic() + max_age if max_age is not None else None
+        self._entries[key] = (value, expires, group)
+        self.size += len(value)
+        if group is not None:
+            self._groups.setdefault(group, set()).add(key)
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_group(self, group: str):
+        self.generation += 1
+        for key in self._groups.pop(group, ()):
+            self._remove(key)
+            self.invalidations += 1
+
+    def invalidate_groups(self):
+        """Drop every grouped entry (all listing snapshots); plain values stay."""
+        self.generation += 1
+        for group in list(self._groups):
+            self.invalidate_group(group)
+
+    def clear(self):
+        self.generation += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._groups.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str):
+        value, _, group = self._entries.pop(key)
+        self.size -= len(value)
+        if group is not None:
+            members = self._groups.get(group)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._groups[group]
@@ -0,0 +1,26 @@
+"""Mock factories shared by the test modules."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+@pytest.fixture
+def pool_for():
+    """Factory for a mock asyncpg pool whose acquire() yields `conn`."""
+    def make(conn):
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+        return pool
+    return make
+
+
+@pytest.fixture
+def locking_redis():
+    """Factory for a mock Redis client that grants (or refuses) redis_lock."""
+    def make(lock_acquired=True):
+        client = MagicMock()
+        client.set = AsyncMock(return_value=lock_acquired)
+        # Release and renew both report that the lock was still ours
+        client.eval = AsyncMock(return_value=1)
+        return client
+    return make
@@ -0,0 +1,60 @@
+"""Redis locks for jobs that must run once across processes and replicas.
+
+Each API process (and each replica) starts the same background loops. A job
+such as the reconciler or the cold-storage spill runs only in whichever
+process acquires its lock; the others skip that round.
+"""
+import uuid
+from contextlib import asynccontextmanager
+
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Push the expiry back only if we still own it
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class HeldLock:
+    """Result of `redis_lock`: truthy if acquired, and renewable while held."""
+
+    def __init__(self, redis_client, name: str, token: str, ttl: int, acquired: bool):
+        self.redis_client = redis_client
+        self.name = name
+        self.token = token
+        self.ttl = ttl
+        self.acquired = acquired
+
+    def __bool__(self) -> bool:
+        return self.acquired
+
+    async def renew(self) -> bool:
+        """Reset the expiry to `ttl`; returns False if the lock was lost meanwhile."""
+        if self.acquired:
+            self.acquired = bool(
+                await self.redis_client.eval(_RENEW_SCRIPT, 1, self.name, self.token, self.ttl)
+            )
+        return self.acquired
+
+
+@asynccontextmanager
+async def redis_lock(redis_client, name: str, ttl: int):
+    """Try to take `name` for up to `ttl` seconds; yields a HeldLock (truthy if acquired)."""
+    token = uuid.uuid4().hex
+    acquired = await redis_client.set(name, token, nx=True, ex=ttl)
+    lock = HeldLock(redis_client, name, token, ttl, bool(acquired))
+    try:
+        yield lock
+    finally:
+        if acquired:
+            await redis_client.eval(_RELEASE_SCRIPT, 1, name, token)
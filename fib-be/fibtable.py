@@ -0,0 +1,43 @@
+"""Precomputed lookup table for small Fibonacci indices.
+
+The table is built once at import time. Under gunicorn with `preload_app`,
+that happens in the master before forking, so every worker shares the same
+pages. Values live in a single bytes blob plus an `array` of offsets rather
+than a list of ints/strs: reading them never touches per-object refcounts,
+so the shared pages are not copied on first access.
+
+Uses the worker's convention: fib(0) = fib(1) = 1.
+"""
+import os
+from array import array
+
+
+# fib(0) .. fib(40): every index the worker accepts (main.FIB_MAX_INDEX)
+FIB_TABLE_SIZE = int(os.getenv("FIB_TABLE_SIZE", "41"))
+
+
+class FibTable:
+    """Read-only table of fib(0) .. fib(size - 1) as decimal strings."""
+
+    def __init__(self, size: int):
+        blob = bytearray()
+        offsets = array("Q", [0])
+        a, b = 1, 1
+        for _ in range(size):
+            blob += str(a).encode()
+            offsets.append(len(blob))
+            a, b = b, a + b
+        self._blob = bytes(blob)
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def get(self, index: int) -> memoryview | None:
+        """Return fib(index) as ASCII digits, or None if outside the table."""
+        if not 0 <= index < len(self):
+            return None
+        return memoryview(self._blob)[self._offsets[index]:self._offsets[index + 1]]
+
+
+TABLE = FibTable(FIB_TABLE_SIZE)
@@ -0,0 +1,19 @@
+# Multi-process serving: gunicorn -c gunicorn.conf.py main:app
+import gc
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app (and build the precomputed tables) once in the master so
+# every worker shares those pages. Connections are opened per worker in the
+# FastAPI lifespan, after the fork.
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's generations, so
+    # GC passes in the workers don't write to (and copy) the shared pages
+    gc.freeze()
@@ -1,14 +1,30 @@
 import os
 import asyncio
+import json
+import secrets
 import time
 import ssl
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import redis.asyncio as redis
 import asyncpg
 
+from cache import ByteLRU
+from coordination import redis_lock
+from bulk import FORMATS, MEDIA_TYPES, InvalidRow, export_rows, import_rows
+from fibtable import TABLE as FIB_TABLE
+from reconciler import reconcile
+from responses import encode_response, json_bytes_response, listing_response, wants_msgpack
+from recurrence import (
+    SEQUENCES, LinearRecurrence, UnknownSequenceError, custom, key_prefix, parse_value_key, to_decimal,
+    value_key,
+)
+from storage import ColdStore, spill_cold_values
+from warmup import PROGRESS_KEY as WARMUP_PROGRESS_KEY, parse_range, warm_up
+
 
 # Environment variables
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
@@ -19,26 +35,256 @@ PGDATABASE = os.getenv("PGDATABASE", "fib")
 PGPASSWORD = os.getenv("PGPASSWORD", "postgres")
 PGPORT = int(os.getenv("PGPORT", "5432"))
 PGSSL = os.getenv("PGSSL", "disable")  # "require" for AWS RDS, "disable" for local
+# Per-process connection budgets: the totals are split across WEB_CONCURRENCY workers
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+PG_MAX_CONNECTIONS = int(os.getenv("PG_MAX_CONNECTIONS", "10"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "100"))
+PG_POOL_SIZE = max(1, PG_MAX_CONNECTIONS // WEB_CONCURRENCY)
+# At least 2: the invalidation listener keeps one connection for its subscription
+REDIS_POOL_SIZE = max(2, REDIS_MAX_CONNECTIONS // WEB_CONCURRENCY)
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+
+# Cold storage tier (disabled when COLD_STORE_DIR is empty)
+COLD_STORE_DIR = os.getenv("COLD_STORE_DIR", "")
+COLD_SIZE_THRESHOLD = int(os.getenv("COLD_SIZE_THRESHOLD", "4096"))  # bytes
+COLD_IDLE_SECONDS = int(os.getenv("COLD_IDLE_SECONDS", "3600"))
+COLD_SPILL_INTERVAL = int(os.getenv("COLD_SPILL_INTERVAL", "300"))  # seconds
+
+# Reconciler for indices whose `insert` message was lost
+RECONCILE_INTERVAL = int(os.getenv("RECONCILE_INTERVAL", "600"))  # seconds, 0 = startup only
+RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "500"))
+RECONCILE_RATE = float(os.getenv("RECONCILE_RATE", "50"))  # re-enqueued jobs per second
+# Highest fib index the worker computes
+FIB_MAX_INDEX = 40
+# Highest index computed by the in-API recurrence engine (fib stays capped by the worker)
+RECURRENCE_MAX_INDEX = int(os.getenv("RECURRENCE_MAX_INDEX", "10000"))
+# Warm-up of a value range at startup, e.g. WARMUP_RANGE=0-1000 (empty = off)
+WARMUP_RANGE = os.getenv("WARMUP_RANGE", "")
+WARMUP_SEQUENCE = os.getenv("WARMUP_SEQUENCE", "fib")
+WARMUP_BATCH_SIZE = int(os.getenv("WARMUP_BATCH_SIZE", "500"))
+# In-process cache of values and listings (0 disables)
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_LISTING_MAX_AGE = float(os.getenv("CACHE_LISTING_MAX_AGE", "30"))  # seconds, backstop for lost messages
+
+# Admin endpoints require this token in X-Admin-Token when set
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # empty = admin endpoints disabled
 
 
 # Global connections
 redis_client: redis.Redis = None
 pg_pool: asyncpg.Pool = None
+cold_store: ColdStore = None
+result_cache: ByteLRU = None
+
+# Custom recurrences already loaded from the sequences table
+custom_sequences: dict[str, LinearRecurrence] = {}
+
+
+def postgres_params() -> dict:
+    """Connection parameters for asyncpg, with SSL when PGSSL=require."""
+    conn_params = {
+        "user": PGUSER,
+        "password": PGPASSWORD,
+        "database": PGDATABASE,
+        "host": PGHOST,
+        "port": PGPORT,
+        "timeout": 5,
+        "min_size": min(2, PG_POOL_SIZE),
+        "max_size": PG_POOL_SIZE
+    }
+
+    # Add SSL if required (AWS RDS)
+    if PGSSL == "require":
+        # Create SSL context that doesn't verify certificates
+        # AWS RDS requires SSL but self-signed certs need verification disabled
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        conn_params["ssl"] = ssl_context
+
+    return conn_params
+
+
+async def get_recurrence(name: str) -> LinearRecurrence | None:
+    """Look up a built-in or registered custom recurrence by name."""
+    if name in SEQUENCES:
+        return SEQUENCES[name]
+    if name not in custom_sequences:
+        async with pg_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT coefficients, initial FROM sequences WHERE name = $1", name
+            )
+        if row is None:
+            return None
+        custom_sequences[name] = LinearRecurrence(
+            name, json.loads(row["coefficients"]), json.loads(row["initial"])
+        )
+    return custom_sequences[name]
+
+
+def max_index(sequence: str) -> int:
+    """Highest index that may be submitted or warmed up for a sequence."""
+    return FIB_MAX_INDEX if sequence == "fib" else RECURRENCE_MAX_INDEX
+
+
+async def require_sequence(name: str) -> LinearRecurrence:
+    """get_recurrence for request handlers: an unknown name is a 400."""
+    recurrence = await get_recurrence(name)
+    if recurrence is None:
+        raise HTTPException(status_code=400, detail=f"Unknown sequence: {name}")
+    return recurrence
+
+
+async def compute_value(recurrence: LinearRecurrence, index: int):
+    """Compute a term with the recurrence engine and store it like worker results."""
+    value = await asyncio.to_thread(lambda: to_decimal(recurrence.nth(index)))
+    key = value_key(recurrence.name, index)
+    await redis_client.set(key, value)
+    await redis_client.publish("computed", key)
+
+
+async def dispatch(sequence: str, index: int):
+    """Send fib indices to the worker; compute every other sequence in-process.
+
+    Raises UnknownSequenceError if the sequence has no definition, e.g. a custom
+    sequence imported without its `sequences` row.
+    """
+    if sequence == "fib":
+        await redis_client.publish("insert", str(index))
+        return
+    recurrence = await get_recurrence(sequence)
+    if recurrence is None:
+        raise UnknownSequenceError(sequence)
+    await compute_value(recurrence, index)
+
+
+async def run_warmup(sequence: str, start: int, end: int):
+    """Fill Redis with values for start..end, logging the outcome."""
+    limit = max_index(sequence)
+    if start > limit:
+        print(f"Warm-up skipped: {sequence} {start}-{end} is past the max index {limit}")
+        return
+    if end > limit:
+        print(f"Warm-up of {sequence} {start}-{end} capped at the max index {limit}")
+        end = limit
+    try:
+        recurrence = await get_recurrence(sequence)
+        if recurrence is None:
+            print(f"Warm-up skipped: unknown sequence {sequence}")
+            return
+        began = time.monotonic()
+        written = await warm_up(redis_client, recurrence, start, end, WARMUP_BATCH_SIZE)
+        if written:
+            print(f"✓ Warmed up {written} {sequence} values ({start}-{end}) "
+                  f"in {time.monotonic() - began:.1f}s")
+    except Exception as e:
+        print(f"Warm-up of {sequence} {start}-{end} failed: {e}")
+
+
+def handle_invalidation(channel: str, data: str):
+    """Drop cached listings made stale by an insert or computed notification."""
+    if channel == "insert":
+        result_cache.invalidate_group("all:fib")
+    elif data == "*":
+        result_cache.invalidate_groups()
+    else:
+        sequence, _ = parse_value_key(data)
+        result_cache.invalidate_group(f"current:{sequence}")
+        if sequence != "fib":
+            # Other sequences have no insert message; their index lists change here too
+            result_cache.invalidate_group(f"all:{sequence}")
+
+
+async def invalidation_listener():
+    """One subscription per process keeps the local cache coherent with every replica."""
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe("insert", "computed")
+            # Anything published while we were not subscribed is lost
+            result_cache.invalidate_groups()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    handle_invalidation(message["channel"], message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Cache invalidation subscription failed: {e}. Resubscribing in 1s...")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+
+async def serve_listing(kind: str, sequence: str, accept: str, build) -> Response:
+    """Serve an encoded listing from the cache, building and caching it on a miss."""
+    if result_cache is None:
+        return await build()
+
+    msgpack = wants_msgpack(accept)
+    key = f"{kind}:{sequence}:{'msgpack' if msgpack else 'json'}"
+    body = result_cache.get(key)
+    if body is not None:
+        return listing_response(body, msgpack)
+
+    generation = result_cache.generation
+    response = await build()
+    # Skip caching if an invalidation arrived while building
+    if result_cache.generation == generation:
+        result_cache.put(key, response.body, max_age=CACHE_LISTING_MAX_AGE, group=f"{kind}:{sequence}")
+    return response
+
+
+async def spill_loop():
+    """Periodically move large or idle values from Redis to the cold store."""
+    while True:
+        await asyncio.sleep(COLD_SPILL_INTERVAL)
+        try:
+            async with redis_lock(redis_client, "spill.lock", COLD_SPILL_INTERVAL) as acquired:
+                if not acquired:
+                    continue
+                spilled = await spill_cold_values(
+                    redis_client, cold_store, COLD_SIZE_THRESHOLD, COLD_IDLE_SECONDS
+                )
+            if spilled:
+                print(f"✓ Spilled {spilled} values to cold storage")
+        except Exception as e:
+            print(f"Cold storage spill failed: {e}")
+
+
+async def reconcile_loop():
+    """Re-enqueue lost jobs at startup, then every RECONCILE_INTERVAL seconds."""
+    while True:
+        try:
+            requeued = await reconcile(
+                pg_pool, redis_client, dispatch, cold_store,
+                batch_size=RECONCILE_BATCH_SIZE, rate=RECONCILE_RATE
+            )
+            if requeued:
+                print(f"✓ Reconciler re-enqueued {requeued} indices")
+        except Exception as e:
+            print(f"Reconciler failed: {e}")
+        if RECONCILE_INTERVAL <= 0:
+            return
+        await asyncio.sleep(RECONCILE_INTERVAL)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize connections on startup with retries, cleanup on shutdown."""
-    global redis_client, pg_pool
+    global redis_client, pg_pool, cold_store, result_cache
 
     # Connect to Redis with retries
     max_retries = 5
     for attempt in range(max_retries):
         try:
-            redis_client = await redis.from_url(
+            # A blocking pool makes callers wait for a free connection when it is
+            # exhausted, instead of failing with "Too many connections"
+            redis_client = await redis.Redis.from_pool(redis.BlockingConnectionPool.from_url(
                 f"redis://{REDIS_HOST}:{REDIS_PORT}",
-                decode_responses=True
-            )
+                decode_responses=True,
+                max_connections=REDIS_POOL_SIZE,
+                timeout=REDIS_POOL_TIMEOUT
+            ))
             print(f"✓ Connected to Redis on attempt {attempt + 1}")
             break
         except Exception as e:
@@ -52,25 +298,7 @@ async def lifespan(app: FastAPI):
     # Connect to PostgreSQL with retries
     for attempt in range(max_retries):
         try:
-            # Prepare connection parameters
-            conn_params = {
-                "user": PGUSER,
-                "password": PGPASSWORD,
-                "database": PGDATABASE,
-                "host": PGHOST,
-                "port": PGPORT,
-                "timeout": 5
-            }
-
-            # Add SSL if required (AWS RDS)
-            if PGSSL == "require":
-                # Create SSL context that doesn't verify certificates
-                # AWS RDS requires SSL but self-signed certs need verification disabled
-                ssl_context = ssl.create_default_context()
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-                conn_params["ssl"] = ssl_context
-
+            conn_params = postgres_params()
             pg_pool = await asyncpg.create_pool(**conn_params)
             print(f"✓ Connected to PostgreSQL on attempt {attempt + 1}")
             break
@@ -122,17 +350,68 @@ async def lifespan(app: FastAPI):
             else:
                 raise
 
-    # Ensure table exists
+    # Ensure tables exist
     async with pg_pool.acquire() as conn:
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS indices (
-                number INTEGER PRIMARY KEY
+        async with conn.transaction():
+            # Serialize schema changes between workers starting at the same time
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('fib-schema'))")
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS indices (
+                    number INTEGER NOT NULL,
+                    sequence TEXT NOT NULL DEFAULT 'fib',
+                    PRIMARY KEY (sequence, number)
+                )
+            """)
+            # Tables created before sequences existed are keyed on number alone
+            await conn.execute(
+                "ALTER TABLE indices ADD COLUMN IF NOT EXISTS sequence TEXT NOT NULL DEFAULT 'fib'"
             )
-        """)
+            pk_columns = await conn.fetchval("""
+                SELECT count(*) FROM information_schema.key_column_usage
+                WHERE table_name = 'indices' AND constraint_name = 'indices_pkey'
+            """)
+            if pk_columns == 1:
+                await conn.execute(
+                    "ALTER TABLE indices DROP CONSTRAINT indices_pkey, ADD PRIMARY KEY (sequence, number)"
+                )
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS sequences (
+                    name TEXT PRIMARY KEY,
+                    coefficients TEXT NOT NULL,
+                    initial TEXT NOT NULL
+                )
+            """)
+
+    spill_task = None
+    if COLD_STORE_DIR:
+        cold_store = ColdStore(COLD_STORE_DIR)
+        spill_task = asyncio.create_task(spill_loop())
+        print(f"✓ Cold storage enabled at {COLD_STORE_DIR} ({len(cold_store)} values)")
+
+    reconcile_task = asyncio.create_task(reconcile_loop())
+
+    invalidation_task = None
+    if CACHE_MAX_BYTES > 0:
+        result_cache = ByteLRU(CACHE_MAX_BYTES)
+        invalidation_task = asyncio.create_task(invalidation_listener())
+
+    warmup_task = None
+    warmup_range = parse_range(WARMUP_RANGE)
+    if warmup_range is not None:
+        warmup_task = asyncio.create_task(run_warmup(WARMUP_SEQUENCE, *warmup_range))
 
     yield
 
     # Cleanup
+    reconcile_task.cancel()
+    if invalidation_task is not None:
+        invalidation_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if spill_task is not None:
+        spill_task.cancel()
+    if cold_store is not None:
+        cold_store.close()
     await redis_client.close()
     await pg_pool.close()
 
@@ -151,6 +430,24 @@ app.add_middleware(
 
 class IndexRequest(BaseModel):
     index: int
+    sequence: str = "fib"
+    # Only for sequence="custom": a(n) = c1*a(n-1) + ... + ck*a(n-k), seeded with a(0..k-1)
+    coefficients: list[int] | None = None
+    initial: list[int] | None = None
+
+
+class WarmupRequest(BaseModel):
+    start: int
+    end: int
+    sequence: str = "fib"
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    """Reject admin requests without the configured token; no token disables them."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
 
 
 @app.get("/")
@@ -159,31 +456,100 @@ def root():
 
 
 @app.get("/values/all")
-async def get_all_indices():
-    """Get all indices from PostgreSQL."""
+async def get_all_indices(sequence: str = "fib", accept: str = Header(default="")):
+    """Get all indices of a sequence from PostgreSQL."""
+    await require_sequence(sequence)
+    return await serve_listing("all", sequence, accept, lambda: build_index_list(sequence, accept))
+
+
+async def build_index_list(sequence: str, accept: str) -> Response:
     async with pg_pool.acquire() as conn:
-        rows = await conn.fetch("SELECT number FROM indices ORDER BY number")
-        return [row["number"] for row in rows]
+        if wants_msgpack(accept):
+            numbers = await conn.fetchval(
+                "SELECT COALESCE(array_agg(number ORDER BY number), '{}') FROM indices WHERE sequence = $1",
+                sequence
+            )
+            return encode_response(numbers, accept)
+
+        # Postgres builds the JSON array; no per-row Records on our side
+        body = await conn.fetchval(
+            "SELECT COALESCE(json_agg(number ORDER BY number), '[]')::text FROM indices WHERE sequence = $1",
+            sequence
+        )
+        return json_bytes_response(body)
 
 
 @app.get("/values/current")
-async def get_current_values():
-    """Get all calculated values from Redis."""
-    keys = await redis_client.keys("values.*")
-    if not keys:
-        return {}
+async def get_current_values(sequence: str = "fib", accept: str = Header(default="")):
+    """Get all calculated values of a sequence from Redis and the cold storage tier."""
+    # Also keeps glob characters out of the KEYS pattern
+    await require_sequence(sequence)
+    return await serve_listing("current", sequence, accept, lambda: build_current_values(sequence, accept))
+
+
+async def build_current_values(sequence: str, accept: str) -> Response:
+    prefix = f"{key_prefix(sequence)}values."
+    keys = await redis_client.keys(f"{prefix}*")
 
-    values = await redis_client.mget(keys)
     result = {}
-    for key, value in zip(keys, values):
-        index = key.split(".")[-1]
-        result[index] = value
+    if keys:
+        values = await redis_client.mget(keys)
+        skip = len(prefix)
+        result = dict(zip([key[skip:] for key in keys], values))
 
+    if cold_store is not None:
+        # Index refresh and page-ins are file I/O; keep them off the event loop
+        cold = await asyncio.to_thread(cold_values, sequence)
+        for index, value in cold.items():
+            result.setdefault(index, value)
+
+    return encode_response(result, accept)
+
+
+def cold_values(sequence: str) -> dict[str, str]:
+    """Every value of a sequence held in the cold store, by index."""
+    result = {}
+    for key in cold_store.keys():
+        key_sequence, index = parse_value_key(key)
+        if key_sequence == sequence:
+            result[index] = str(cold_store.get(key), "ascii")
     return result
 
 
+@app.get("/values/{index}")
+async def get_value(index: int, sequence: str = "fib"):
+    """Get a single value from the precomputed table, Redis, or cold storage."""
+    await require_sequence(sequence)
+    # Same bound as POST /values, whatever the precomputed table holds
+    if index > max_index(sequence):
+        raise HTTPException(status_code=422, detail=f"Index too high (max {max_index(sequence)})")
+    if sequence == "fib":
+        cached = FIB_TABLE.get(index)
+        if cached is not None:
+            return Response(bytes(cached), media_type="text/plain")
+
+    key = value_key(sequence, index)
+    if result_cache is not None:
+        body = result_cache.get(f"value:{key}")
+        if body is not None:
+            return PlainTextResponse(body)
+
+    value = await redis_client.get(key)
+    if value is not None:
+        body = value.encode()
+        # Computed values never change, so they need no invalidation
+        if result_cache is not None:
+            result_cache.put(f"value:{key}", body)
+        return PlainTextResponse(body)
+
+    if cold_store is not None and key in cold_store:
+        return StreamingResponse(cold_store.iter_chunks(key), media_type="text/plain")
+
+    raise HTTPException(status_code=404, detail="Value not calculated yet")
+
+
 @app.post("/values")
-async def submit_index(req: IndexRequest):
+async def submit_index(req: IndexRequest, background_tasks: BackgroundTasks):
     """Submit new index for calculation."""
     index = req.index
 
@@ -191,20 +557,90 @@ async def submit_index(req: IndexRequest):
     if index < 0:
         raise HTTPException(status_code=400, detail="Index must be non-negative")
 
-    if index > 40:
-        raise HTTPException(status_code=422, detail="Index too high (max 40)")
+    if index > max_index(req.sequence):
+        raise HTTPException(status_code=422, detail=f"Index too high (max {max_index(req.sequence)})")
+
+    if req.sequence == "custom":
+        try:
+            recurrence = custom(req.coefficients or [], req.initial or [])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        async with pg_pool.acquire() as conn:
+            await conn.execute(
+                "INSERT INTO sequences (name, coefficients, initial) VALUES ($1, $2, $3) "
+                "ON CONFLICT DO NOTHING",
+                recurrence.name, json.dumps(recurrence.coefficients), json.dumps(recurrence.initial)
+            )
+        custom_sequences[recurrence.name] = recurrence
+    else:
+        recurrence = await require_sequence(req.sequence)
 
     # Store in PostgreSQL
     async with pg_pool.acquire() as conn:
         await conn.execute(
-            "INSERT INTO indices (number) VALUES ($1) ON CONFLICT DO NOTHING",
-            index
+            "INSERT INTO indices (number, sequence) VALUES ($1, $2) ON CONFLICT DO NOTHING",
+            index, recurrence.name
         )
 
-    # Publish to Redis for worker
-    await redis_client.publish("insert", str(index))
+    # Drop our own listing now; other processes drop theirs on the notification
+    if result_cache is not None:
+        result_cache.invalidate_group(f"all:{recurrence.name}")
 
-    return {"working": True, "index": index}
+    if recurrence.name == "fib":
+        # Publish to Redis for worker
+        await redis_client.publish("insert", str(index))
+        return {"working": True, "index": index}
+
+    background_tasks.add_task(compute_value, recurrence, index)
+    return {"working": True, "index": index, "sequence": recurrence.name}
+
+
+@app.get("/admin/export", dependencies=[Depends(require_admin)])
+async def export_values(format: str = Query("ndjson", pattern=f"^({'|'.join(FORMATS)})$")):
+    """Stream all indices and their values as NDJSON or CSV."""
+    return StreamingResponse(
+        export_rows(pg_pool, redis_client, cold_store, format),
+        media_type=MEDIA_TYPES[format]
+    )
+
+
+@app.post("/admin/import", dependencies=[Depends(require_admin)])
+async def import_values(request: Request,
+                        format: str = Query("ndjson", pattern=f"^({'|'.join(FORMATS)})$")):
+    """Bulk-load indices and values from an NDJSON or CSV request body."""
+    try:
+        stats = await import_rows(pg_pool, redis_client, request.stream(), get_recurrence, max_index, format)
+    except InvalidRow as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import row, {e}")
+    return stats.as_dict()
+
+
+@app.post("/admin/warmup", dependencies=[Depends(require_admin)])
+async def start_warmup(req: WarmupRequest, background_tasks: BackgroundTasks):
+    """Start (or resume) filling Redis with values for an index range."""
+    if req.start < 0 or req.end < req.start:
+        raise HTTPException(status_code=400, detail="Range must satisfy 0 <= start <= end")
+    if req.end > max_index(req.sequence):
+        raise HTTPException(status_code=422, detail=f"Index too high (max {max_index(req.sequence)})")
+    await require_sequence(req.sequence)
+
+    background_tasks.add_task(run_warmup, req.sequence, req.start, req.end)
+    return {"started": True, "sequence": req.sequence, "start": req.start, "end": req.end}
+
+
+@app.get("/admin/warmup", dependencies=[Depends(require_admin)])
+async def warmup_progress():
+    """Next index to compute for each warm-up range that has been started."""
+    progress = await redis_client.hgetall(WARMUP_PROGRESS_KEY)
+    return {field: int(next_index) for field, next_index in progress.items()}
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters of this process's in-process cache."""
+    if result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
 
 
 @app.get("/health")
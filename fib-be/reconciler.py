@@ -0,0 +1,103 @@
+"""Re-enqueue indices whose values never got computed.
+
+The `insert` channel is plain pub/sub, so a message published while no worker
+is subscribed is lost and the index stays in Postgres without a `values.<n>`
+key. The reconciler pages through `indices` with keyset queries, checks the
+matching keys in pipelined batches, and re-dispatches only the missing ones at
+a bounded rate.
+"""
+import asyncio
+import time
+
+from coordination import redis_lock
+from recurrence import UnknownSequenceError, value_key
+
+
+LOCK_KEY = "reconcile.lock"
+
+
+class RateLimiter:
+    """Spaces calls to `wait()` so no more than `rate` happen per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+            now = self._next
+        self._next = max(self._next, now) + self.interval
+
+
+async def reconcile(pg_pool, redis_client, dispatch, cold_store=None, batch_size: int = 500,
+                    rate: float = 50, lock_ttl: int = 600) -> int:
+    """Call `dispatch(sequence, index)` for every index with no computed value.
+
+    Only one replica reconciles at a time; the others return 0 straight away.
+    Returns the number of indices re-enqueued. Indices of sequences that
+    `dispatch` does not know (UnknownSequenceError) are skipped and reported.
+    """
+    async with redis_lock(redis_client, LOCK_KEY, lock_ttl) as lock:
+        if not lock:
+            return 0
+
+        limiter = RateLimiter(rate)
+        requeued = 0
+        unknown: dict[str, int] = {}
+        last = ("", -1)
+        while True:
+            # Short keyset queries: no connection or transaction is held while
+            # checking Redis and waiting on the rate limiter
+            async with pg_pool.acquire() as conn:
+                records = await conn.fetch(
+                    "SELECT sequence, number FROM indices WHERE (sequence, number) > ($1, $2) "
+                    "ORDER BY sequence, number LIMIT $3",
+                    *last, batch_size
+                )
+            if not records:
+                break
+
+            batch = [(record["sequence"], record["number"]) for record in records]
+            requeued += await _requeue_missing(redis_client, dispatch, cold_store, batch, limiter, unknown)
+            last = batch[-1]
+
+            if len(batch) < batch_size:
+                break
+            if not await lock.renew():
+                print("Reconciler lost its lock; stopping this round")
+                break
+
+        for sequence, count in unknown.items():
+            print(f"Reconciler skipped {count} indices of unknown sequence {sequence}")
+        return requeued
+
+
+async def _requeue_missing(redis_client, dispatch, cold_store, rows, limiter, unknown) -> int:
+    keys = [value_key(sequence, index) for sequence, index in rows]
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.exists(key)
+    exists = await pipe.execute()
+
+    requeued = 0
+    for (sequence, index), key, found in zip(rows, keys, exists):
+        if found:
+            continue
+        # Spilled values are not in Redis but are not lost either
+        if cold_store is not None and key in cold_store:
+            continue
+        if sequence in unknown:
+            unknown[sequence] += 1
+            continue
+        await limiter.wait()
+        try:
+            await dispatch(sequence, index)
+        except UnknownSequenceError:
+            unknown[sequence] = 1
+            continue
+        requeued += 1
+    return requeued
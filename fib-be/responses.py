@@ -0,0 +1,37 @@
+"""Fast encoders for the large listing responses.
+
+Listings bypass FastAPI's `jsonable_encoder`. JSON is either produced by
+Postgres (`json_agg`) and passed through as bytes, or encoded in one call with
+orjson. Clients that send `Accept: application/msgpack` get msgpack instead,
+so every listing response carries `Vary: Accept` for caches in front of us.
+"""
+import msgpack
+import orjson
+from fastapi.responses import Response
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def wants_msgpack(accept: str) -> bool:
+    """True if the Accept header asks for msgpack."""
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+def listing_response(body: bytes | str, msgpack_body: bool = False) -> Response:
+    """Response for an already encoded listing body."""
+    media_type = "application/msgpack" if msgpack_body else "application/json"
+    return Response(body, media_type=media_type, headers=VARY_ACCEPT)
+
+
+def json_bytes_response(body: bytes | str) -> Response:
+    """Response for JSON that is already encoded."""
+    return listing_response(body)
+
+
+def encode_response(payload, accept: str = "") -> Response:
+    """Encode a list/dict as msgpack or JSON, depending on the Accept header."""
+    if wants_msgpack(accept):
+        return listing_response(msgpack.packb(payload), msgpack_body=True)
+    return json_bytes_response(orjson.dumps(payload))
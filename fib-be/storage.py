@@ -0,0 +1,194 @@
+"""Cold storage tier for computed values.
+
+Values that are large or have not been read recently are moved out of Redis
+into an append-only data file. A second append-only file holds the offset
+index, so the store can be reopened (or shared between processes on the same
+volume) without scanning the data file. Reads go through a memory map and
+hand back memoryview slices, so serving a value never copies it into a new
+Python object.
+
+Every method does blocking file I/O (and `put` may wait on another process's
+lock), so async callers run them with `asyncio.to_thread`.
+"""
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import threading
+
+
+# Index record header: key length, value offset, value length
+_INDEX_HEADER = struct.Struct("<HQQ")
+
+# Chunk size used when streaming values out of the map
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ColdStore:
+    """Append-only, memory-mapped value store keyed by Redis key name."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, "values.dat")
+        self.index_path = os.path.join(directory, "values.idx")
+
+        self._data_fd = os.open(self.data_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._index_fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._offsets: dict[str, tuple[int, int]] = {}
+        self._index_pos = 0
+        self._mm: mmap.mmap | None = None
+        self._mapped_size = 0
+        # Guards the in-memory index and map when called from worker threads
+        self._lock = threading.RLock()
+
+        self.refresh()
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def keys(self) -> list[str]:
+        """Return every key held in the store."""
+        self.refresh()
+        return list(self._offsets)
+
+    def refresh(self):
+        """Pick up index records appended since the last read (possibly by another process)."""
+        with self._lock:
+            size = os.fstat(self._index_fd).st_size
+            if size <= self._index_pos:
+                return
+
+            raw = os.pread(self._index_fd, size - self._index_pos, self._index_pos)
+            pos = 0
+            while pos + _INDEX_HEADER.size <= len(raw):
+                key_len, offset, length = _INDEX_HEADER.unpack_from(raw, pos)
+                end = pos + _INDEX_HEADER.size + key_len
+                if end > len(raw):
+                    # Partially written record, pick it up next time
+                    break
+                key = raw[pos + _INDEX_HEADER.size:end].decode()
+                self._offsets[key] = (offset, length)
+                pos = end
+            self._index_pos += pos
+
+    def put(self, key: str, value: str | bytes):
+        """Append a value and record its offset. Later writes for a key win."""
+        self.put_many([(key, value)])
+
+    def put_many(self, items: list[tuple[str, str | bytes]]):
+        """Append several values under one file lock."""
+        # Lock so data and index records from concurrent writers stay paired
+        fcntl.flock(self._index_fd, fcntl.LOCK_EX)
+        try:
+            for key, value in items:
+                data = value.encode() if isinstance(value, str) else value
+                encoded_key = key.encode()
+                offset = os.fstat(self._data_fd).st_size
+                os.write(self._data_fd, data)
+                os.write(self._index_fd, _INDEX_HEADER.pack(len(encoded_key), offset, len(data)) + encoded_key)
+        finally:
+            fcntl.flock(self._index_fd, fcntl.LOCK_UN)
+
+        self.refresh()
+
+    def get(self, key: str) -> memoryview | None:
+        """Return a zero-copy view of the stored value, or None if absent."""
+        location = self._lookup(key)
+        if location is None:
+            return None
+
+        offset, length = location
+        if length == 0:
+            return memoryview(b"")
+        with self._lock:
+            if offset + length > self._mapped_size:
+                self._remap()
+            return memoryview(self._mm)[offset:offset + length]
+
+    def iter_chunks(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE):
+        """Yield a stored value as memoryview chunks for streaming responses."""
+        view = self.get(key)
+        if view is None:
+            return
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+    def close(self):
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # A response is still streaming from the map; let GC release it
+                pass
+        os.close(self._data_fd)
+        os.close(self._index_fd)
+
+    def _lookup(self, key: str) -> tuple[int, int] | None:
+        location = self._offsets.get(key)
+        if location is None:
+            self.refresh()
+            location = self._offsets.get(key)
+        return location
+
+    def _remap(self):
+        size = os.fstat(self._data_fd).st_size
+        if size == 0:
+            return
+        # Old maps are not closed here: views handed out earlier keep them alive
+        self._mm = mmap.mmap(self._data_fd, size, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+
+
+async def spill_cold_values(redis_client, store: ColdStore, size_threshold: int,
+                            idle_seconds: int, batch_size: int = 500) -> int:
+    """Move large or idle value keys (of any sequence) from Redis into the cold store.
+
+    Returns the number of keys spilled.
+    """
+    spilled = 0
+    batch = []
+    async for key in redis_client.scan_iter(match="*values.*", count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            spilled += await _spill_batch(redis_client, store, batch, size_threshold, idle_seconds)
+            batch = []
+    if batch:
+        spilled += await _spill_batch(redis_client, store, batch, size_threshold, idle_seconds)
+    return spilled
+
+
+async def _spill_batch(redis_client, store, keys, size_threshold, idle_seconds) -> int:
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        # Neither command counts as an access, so they leave the idle clock alone.
+        # MEMORY USAGE includes Redis' per-key overhead, slightly above the value length.
+        pipe.object("idletime", key)
+        pipe.memory_usage(key)
+    # OBJECT IDLETIME errors under LFU eviction policies; treat as "not idle"
+    stats = await pipe.execute(raise_on_error=False)
+
+    candidates = []
+    for i, key in enumerate(keys):
+        idle, size = stats[2 * i], stats[2 * i + 1]
+        if isinstance(idle, Exception):
+            idle = 0
+        if isinstance(size, Exception):
+            continue
+        if (size or 0) > size_threshold or (idle or 0) > idle_seconds:
+            candidates.append(key)
+    if not candidates:
+        return 0
+
+    values = await redis_client.mget(candidates)
+    items = [(key, value) for key, value in zip(candidates, values) if value is not None]
+    spilled = [key for key, _ in items]
+
+    if spilled:
+        # Appends and flock on a possibly shared volume; keep them off the event loop
+        await asyncio.to_thread(store.put_many, items)
+        await redis_client.delete(*spilled)
+    return len(spilled)
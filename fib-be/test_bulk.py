@@ -0,0 +1,215 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from bulk import InvalidRow, export_rows, format_definition, import_rows, iter_lines, parse_row
+from recurrence import SEQUENCES, custom
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.fixture
+def make_pg_pool(pool_for):
+    def make(copy_chunks=(), definitions=()):
+        """Mock pool whose COPY feeds the given chunks to the output callback."""
+        async def copy_from_query(query, output, format):
+            for chunk in copy_chunks:
+                await output(chunk)
+
+        conn = AsyncMock()
+        conn.copy_from_query = copy_from_query
+        conn.fetch = AsyncMock(return_value=[
+            {"name": r.name, "coefficients": json.dumps(r.coefficients), "initial": json.dumps(r.initial)}
+            for r in definitions
+        ])
+        conn.transaction = MagicMock()
+        conn.transaction.return_value.__aenter__ = AsyncMock(return_value=None)
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
+        return pool_for(conn), conn
+    return make
+
+
+async def get_recurrence(name):
+    return SEQUENCES.get(name)
+
+
+def max_index(sequence):
+    return 40 if sequence == "fib" else 10000
+
+
+async def collect(gen):
+    return b"".join([chunk async for chunk in gen])
+
+
+class TestParsing:
+    """Test line splitting and row parsing."""
+
+    @pytest.mark.asyncio
+    async def test_iter_lines_across_chunks(self):
+        lines = [line async for line in iter_lines(chunks_of(b"1\n2", b"0\n3", b"0"))]
+        assert lines == [b"1", b"20", b"30"]
+
+    def test_parse_csv(self):
+        assert parse_row("csv", b"sequence,index,value") is None
+        assert parse_row("csv", b"lucas,10,123") == ("lucas", 10, "123")
+        assert parse_row("csv", b"fib,10,") == ("fib", 10, None)
+
+    def test_parse_two_column_csv_as_fib(self):
+        assert parse_row("csv", b"index,value") is None
+        assert parse_row("csv", b"10,89") == ("fib", 10, "89")
+
+    def test_parse_ndjson(self):
+        assert parse_row("ndjson", b'{"sequence": "lucas", "index": 10, "value": "123"}') == ("lucas", 10, "123")
+        assert parse_row("ndjson", b'{"index": 10, "value": null}') == ("fib", 10, None)
+        assert parse_row("ndjson", b"  ") is None
+        assert parse_row("ndjson", b'{"index": 10, "value": 89}') == ("fib", 10, "89")
+
+    @pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+    def test_definition_round_trip(self, fmt):
+        recurrence = custom([2, -1], [0, 1])
+        parsed = parse_row(fmt, format_definition(fmt, recurrence))
+        assert (parsed.name, parsed.coefficients, parsed.initial) == (recurrence.name, [2, -1], [0, 1])
+
+    def test_definition_must_match_its_name(self):
+        line = format_definition("ndjson", custom([2, 1], [0, 1])).replace(b"[0, 1]", b"[0, 2]")
+        with pytest.raises(ValueError):
+            parse_row("ndjson", line)
+        with pytest.raises(ValueError):
+            parse_row("csv", b"custom-000000000000,definition,2 1;x")
+
+    @pytest.mark.parametrize("fmt,line", [
+        ("csv", b"fib,-5,"),
+        ("csv", b"fib,x,"),
+        ("csv", b"fib,1,2,3"),
+        ("csv", b"lucas,10,not-a-number"),
+        ("ndjson", b'{"sequence": "*", "index": 3, "value": "not-a-number"}'),
+        ("ndjson", b'{"index": null}'),
+        ("ndjson", b'{"index": true}'),
+        ("ndjson", b'{"sequence": 5, "index": 1}'),
+        ("ndjson", b"[1, 2]"),
+        ("ndjson", b"{"),
+    ])
+    def test_parse_rejects_malformed_rows(self, fmt, line):
+        with pytest.raises(ValueError):
+            parse_row(fmt, line)
+
+
+class TestExport:
+    """Test streaming export."""
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, make_pg_pool):
+        pg_pool, _ = make_pg_pool([b"fib,1\nfib,5", b"\nlucas,10\n"])
+        redis_client = MagicMock()
+        redis_client.mget = AsyncMock(side_effect=[["1", "8"], [None]])
+
+        body = await collect(export_rows(pg_pool, redis_client, batch_size=2))
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert rows == [
+            {"sequence": "fib", "index": 1, "value": "1"},
+            {"sequence": "fib", "index": 5, "value": "8"},
+            {"sequence": "lucas", "index": 10, "value": None},
+        ]
+        assert redis_client.mget.call_args_list[1].args[0] == ["lucas:values.10"]
+
+    @pytest.mark.asyncio
+    async def test_export_csv_uses_cold_store(self, make_pg_pool, tmp_path):
+        from storage import ColdStore
+        store = ColdStore(str(tmp_path))
+        store.put("values.10", "89")
+        pg_pool, _ = make_pg_pool([b"fib,1\nfib,10\n"])
+        redis_client = MagicMock()
+        redis_client.mget = AsyncMock(return_value=["1", None])
+
+        try:
+            body = await collect(export_rows(pg_pool, redis_client, store, fmt="csv"))
+        finally:
+            store.close()
+
+        assert body == b"sequence,index,value\nfib,1,1\nfib,10,89\n"
+
+    @pytest.mark.asyncio
+    async def test_export_writes_definitions_first(self, make_pg_pool):
+        recurrence = custom([2, 1], [0, 1])
+        pg_pool, _ = make_pg_pool([f"{recurrence.name},5\n".encode()], definitions=[recurrence])
+        redis_client = MagicMock()
+        redis_client.mget = AsyncMock(return_value=["12"])
+
+        body = await collect(export_rows(pg_pool, redis_client, fmt="csv"))
+
+        assert body == (b"sequence,index,value\n"
+                        + f"{recurrence.name},definition,2 1;0 1\n{recurrence.name},5,12\n".encode())
+
+
+class TestImport:
+    """Test bulk import."""
+
+    @pytest.mark.asyncio
+    async def test_import_rows(self, make_pg_pool):
+        pg_pool, conn = make_pg_pool()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        redis_client.publish = AsyncMock()
+
+        stats = await import_rows(
+            pg_pool, redis_client,
+            chunks_of(b"sequence,index,value\nfib,1,1\nlucas,10,", b"123\nfib,20,\nlucas,30,\n"),
+            get_recurrence, max_index, fmt="csv"
+        )
+
+        assert stats.rows == 4
+        conn.copy_records_to_table.assert_called_once_with(
+            "indices_import", records=[(1, "fib"), (10, "lucas"), (20, "fib"), (30, "lucas")],
+            columns=["number", "sequence"]
+        )
+        pipe.set.assert_any_call("values.1", "1")
+        pipe.set.assert_any_call("lucas:values.10", "123")
+        pipe.publish.assert_called_once_with("insert", "20")
+        assert "DROP TABLE" in conn.execute.call_args_list[-1].args[0]
+        redis_client.publish.assert_called_once_with("computed", "*")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body,reason", [
+        (b"fib,1000000000,\n", "index too high (max 40)"),
+        (b"lucas,10001,\n", "index too high (max 10000)"),
+        (b"*,3,5\n", "unknown sequence *"),
+        (b"fib,-5,\n", "index must be a non-negative integer"),
+    ])
+    async def test_import_rejects_bad_rows(self, make_pg_pool, body, reason):
+        pg_pool, conn = make_pg_pool()
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock()
+
+        with pytest.raises(InvalidRow) as excinfo:
+            await import_rows(pg_pool, redis_client, chunks_of(b"fib,1,1\n" + body),
+                              get_recurrence, max_index, fmt="csv")
+
+        assert str(excinfo.value) == f"line 2: {reason}"
+        conn.copy_records_to_table.assert_not_called()
+        redis_client.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_import_registers_definitions(self, make_pg_pool):
+        recurrence = custom([2, 1], [0, 1])
+        pg_pool, conn = make_pg_pool()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        redis_client.publish = AsyncMock()
+        body = format_definition("ndjson", recurrence) + json.dumps(
+            {"sequence": recurrence.name, "index": 5, "value": "12"}
+        ).encode()
+
+        # get_recurrence knows nothing custom; the definition row makes the value row valid
+        stats = await import_rows(pg_pool, redis_client, chunks_of(body), get_recurrence, max_index)
+
+        assert stats.rows == 1
+        insert = next(c.args for c in conn.execute.call_args_list if "INTO sequences" in c.args[0])
+        assert insert[1:] == (recurrence.name, "[2, 1]", "[0, 1]")
+        pipe.set.assert_called_once_with(f"{recurrence.name}:values.5", "12")
@@ -0,0 +1,60 @@
+import time
+from cache import ByteLRU
+
+
+class TestByteLRU:
+    """Test size-bounded LRU behaviour and invalidation."""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = ByteLRU(max_bytes=10, max_item_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("c") == b"cccc"
+        assert cache.size == 8
+        assert cache.evictions == 1
+
+    def test_skips_oversized_items(self):
+        cache = ByteLRU(max_bytes=100, max_item_bytes=5)
+        cache.put("big", b"x" * 6)
+        assert cache.get("big") is None
+        assert cache.size == 0
+
+    def test_counts_hits_and_misses(self):
+        cache = ByteLRU(max_bytes=100)
+        cache.put("a", b"1")
+        cache.get("a")
+        cache.get("b")
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_max_age(self):
+        cache = ByteLRU(max_bytes=100)
+        cache.put("a", b"1", max_age=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.size == 0
+
+    def test_invalidate_group_keeps_other_entries(self):
+        cache = ByteLRU(max_bytes=100)
+        cache.put("current:fib:json", b"{}", group="current:fib")
+        cache.put("current:fib:msgpack", b"\x80", group="current:fib")
+        cache.put("all:fib:json", b"[]", group="all:fib")
+        cache.put("value:values.5", b"8")
+        generation = cache.generation
+
+        cache.invalidate_group("current:fib")
+
+        assert cache.get("current:fib:json") is None
+        assert cache.get("current:fib:msgpack") is None
+        assert cache.get("all:fib:json") == b"[]"
+        assert cache.generation > generation
+
+        cache.invalidate_groups()
+        assert cache.get("all:fib:json") is None
+        assert cache.get("value:values.5") == b"8"
+        assert cache.invalidations == 3
@@ -0,0 +1,37 @@
+import pytest
+from unittest.mock import AsyncMock
+from coordination import redis_lock
+
+
+class TestRedisLock:
+    """Test the single-runner lock for background jobs."""
+
+    @pytest.mark.asyncio
+    async def test_acquired_lock_is_released(self, locking_redis):
+        redis_client = locking_redis()
+
+        async with redis_lock(redis_client, "job.lock", 60) as acquired:
+            assert acquired
+
+        token = redis_client.set.call_args.args[1]
+        redis_client.set.assert_called_once_with("job.lock", token, nx=True, ex=60)
+        assert redis_client.eval.call_args.args[1:] == (1, "job.lock", token)
+
+    @pytest.mark.asyncio
+    async def test_held_lock_is_left_alone(self, locking_redis):
+        redis_client = locking_redis(lock_acquired=None)
+
+        async with redis_lock(redis_client, "job.lock", 60) as acquired:
+            assert not acquired
+
+        redis_client.eval.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_renew_reports_a_lost_lock(self, locking_redis):
+        redis_client = locking_redis()
+
+        async with redis_lock(redis_client, "job.lock", 60) as lock:
+            assert await lock.renew()
+            redis_client.eval = AsyncMock(return_value=0)
+            assert not await lock.renew()
+            assert not lock
@@ -1,7 +1,10 @@
+import msgpack
 import pytest
 from httpx import AsyncClient, ASGITransport
 from unittest.mock import AsyncMock, MagicMock, patch
 from main import app
+from cache import ByteLRU
+from storage import ColdStore
 
 
 @pytest.fixture
@@ -10,7 +13,9 @@ def mock_redis():
     mock = AsyncMock()
     mock.keys = AsyncMock(return_value=[])
     mock.mget = AsyncMock(return_value=[])
+    mock.get = AsyncMock(return_value=None)
     mock.publish = AsyncMock()
+    mock.set = AsyncMock()
     mock.ping = AsyncMock()
     mock.close = AsyncMock()
     return mock
@@ -40,7 +45,7 @@ def mock_pg_pool():
 async def client(mock_redis, mock_pg_pool):
     """Create test client with mocked dependencies."""
     # Patch global connections before app lifespan
-    with patch('main.redis.from_url', return_value=mock_redis), \
+    with patch('main.redis.Redis.from_pool', return_value=mock_redis), \
          patch('main.asyncpg.create_pool', return_value=mock_pg_pool):
 
         async with AsyncClient(
@@ -54,6 +59,14 @@ async def client(mock_redis, mock_pg_pool):
             yield ac
 
 
+@pytest.fixture
+def admin_client(client):
+    """Client sending the admin token, with one configured."""
+    with patch('main.ADMIN_TOKEN', 'secret'):
+        client.headers["X-Admin-Token"] = "secret"
+        yield client
+
+
 class TestBasicEndpoints:
     """Test basic API endpoints."""
 
@@ -77,9 +90,9 @@ class TestGetAllIndices:
 
     @pytest.mark.asyncio
     async def test_get_all_indices_empty(self, client, mock_pg_pool):
-        # Mock empty result
+        # Mock empty result (Postgres aggregates the JSON array)
         mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
-        mock_conn.fetch.return_value = []
+        mock_conn.fetchval.return_value = "[]"
 
         response = await client.get("/values/all")
         assert response.status_code == 200
@@ -89,15 +102,24 @@ class TestGetAllIndices:
     async def test_get_all_indices_with_data(self, client, mock_pg_pool):
         # Mock database returning indices
         mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
-        mock_conn.fetch.return_value = [
-            {"number": 1},
-            {"number": 5},
-            {"number": 10}
-        ]
+        mock_conn.fetchval.return_value = "[1, 5, 10]"
 
         response = await client.get("/values/all")
         assert response.status_code == 200
         assert response.json() == [1, 5, 10]
+        assert response.headers["vary"] == "Accept"
+        assert "json_agg" in mock_conn.fetchval.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_get_all_indices_msgpack(self, client, mock_pg_pool):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchval.return_value = [1, 5, 10]
+
+        response = await client.get("/values/all", headers={"Accept": "application/msgpack"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        assert response.headers["vary"] == "Accept"
+        assert msgpack.unpackb(response.content) == [1, 5, 10]
 
 
 class TestGetCurrentValues:
@@ -123,6 +145,85 @@ class TestGetCurrentValues:
         data = response.json()
         assert data == {"1": "1", "5": "5", "10": "55"}
 
+    @pytest.mark.asyncio
+    async def test_get_current_values_msgpack(self, client, mock_redis):
+        mock_redis.keys.return_value = ["values.1", "values.10"]
+        mock_redis.mget.return_value = ["1", "89"]
+
+        response = await client.get("/values/current", headers={"Accept": "application/x-msgpack"})
+        assert response.status_code == 200
+        assert msgpack.unpackb(response.content) == {"1": "1", "10": "89"}
+
+
+class TestColdStorageReads:
+    """Test reads served from the cold storage tier."""
+
+    @pytest.fixture
+    def cold_store(self, tmp_path):
+        import main
+        store = ColdStore(str(tmp_path))
+        main.cold_store = store
+        yield store
+        main.cold_store = None
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_get_value_from_redis(self, client, mock_redis):
+        mock_redis.get.return_value = "55"
+
+        response = await client.get("/values/5000", params={"sequence": "lucas"})
+        assert response.status_code == 200
+        assert response.text == "55"
+        mock_redis.get.assert_called_once_with("lucas:values.5000")
+
+    @pytest.mark.asyncio
+    async def test_get_value_from_cold_store(self, client, mock_redis, cold_store):
+        cold_store.put("lucas:values.5000", "55")
+
+        response = await client.get("/values/5000", params={"sequence": "lucas"})
+        assert response.status_code == 200
+        assert response.text == "55"
+
+    @pytest.mark.asyncio
+    async def test_get_value_missing(self, client, mock_redis, cold_store):
+        response = await client.get("/values/5000", params={"sequence": "lucas"})
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_current_values_merges_cold_store(self, client, mock_redis, cold_store):
+        mock_redis.keys.return_value = ["values.1"]
+        mock_redis.mget.return_value = ["1"]
+        cold_store.put("values.10", "55")
+
+        response = await client.get("/values/current")
+        assert response.status_code == 200
+        assert response.json() == {"1": "1", "10": "55"}
+
+
+class TestPrecomputedTable:
+    """Test reads served from the preloaded lookup table."""
+
+    @pytest.mark.asyncio
+    async def test_small_index_skips_redis(self, client, mock_redis):
+        response = await client.get("/values/10")
+        assert response.status_code == 200
+        assert response.text == "89"
+        mock_redis.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reads_capped_like_submit(self, client, mock_redis):
+        response = await client.get("/values/41")
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Index too high (max 40)"
+        mock_redis.get.assert_not_called()
+
+    def test_table_matches_worker_convention(self):
+        from fibtable import FibTable
+        table = FibTable(5)
+        assert [bytes(table.get(i)) for i in range(5)] == [b"1", b"1", b"2", b"3", b"5"]
+        assert table.get(5) is None
+        assert table.get(-1) is None
+
 
 class TestSubmitIndex:
     """Test POST /values endpoint."""
@@ -206,6 +307,243 @@ class TestDuplicateIndex:
         assert mock_redis.publish.call_count == 2
 
 
+class TestAdminEndpoints:
+    """Test admin token handling."""
+
+    @pytest.mark.asyncio
+    async def test_admin_token_required_when_configured(self, client):
+        with patch('main.ADMIN_TOKEN', 'secret'):
+            response = await client.get("/admin/export")
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("method,path", [
+        ("GET", "/admin/export"), ("POST", "/admin/import"), ("POST", "/admin/warmup"), ("GET", "/admin/warmup"),
+    ])
+    async def test_admin_disabled_without_token(self, client, method, path):
+        response = await client.request(method, path, headers={"X-Admin-Token": ""})
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [b'{"index": -5}', b'{"index": 41}', b'{"index": null}', b"[1]"])
+    async def test_import_rejects_bad_rows(self, admin_client, mock_redis, body):
+        response = await admin_client.post("/admin/import", content=body)
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid import row, line 1: ")
+
+    @pytest.mark.asyncio
+    async def test_export_rejects_unknown_format(self, admin_client):
+        response = await admin_client.get("/admin/export", params={"format": "xml"})
+        assert response.status_code == 422
+
+
+class TestSequences:
+    """Test submitting and reading non-Fibonacci sequences."""
+
+    @pytest.mark.asyncio
+    async def test_submit_lucas_computes_in_api(self, client, mock_pg_pool, mock_redis):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+
+        response = await client.post("/values", json={"index": 10, "sequence": "lucas"})
+        assert response.status_code == 200
+        assert response.json() == {"working": True, "index": 10, "sequence": "lucas"}
+
+        assert mock_conn.execute.call_args[0][1:] == (10, "lucas")
+        # Not sent to the worker; only the completion notification is published
+        mock_redis.set.assert_called_once_with("lucas:values.10", "123")
+        mock_redis.publish.assert_called_once_with("computed", "lucas:values.10")
+
+    @pytest.mark.asyncio
+    async def test_submit_custom_registers_definition(self, client, mock_pg_pool, mock_redis):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+
+        response = await client.post(
+            "/values", json={"index": 5, "sequence": "custom", "coefficients": [2], "initial": [3]}
+        )
+        assert response.status_code == 200
+        name = response.json()["sequence"]
+        assert name.startswith("custom-")
+
+        sequences_insert = mock_conn.execute.call_args_list[0][0]
+        assert "INSERT INTO sequences" in sequences_insert[0]
+        mock_redis.set.assert_called_once_with(f"{name}:values.5", "96")
+
+    @pytest.mark.asyncio
+    async def test_submit_unknown_sequence(self, client, mock_pg_pool):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchrow.return_value = None
+
+        response = await client.post("/values", json={"index": 5, "sequence": "nope"})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/values/all", "/values/current", "/values/5"])
+    async def test_reads_reject_unknown_sequence(self, client, mock_pg_pool, mock_redis, path):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchrow.return_value = None
+
+        response = await client.get(path, params={"sequence": "*"})
+        assert response.status_code == 400
+        mock_redis.keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_reports_unknown_sequence(self, client, mock_pg_pool, mock_redis):
+        import main
+        from recurrence import UnknownSequenceError
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchrow.return_value = None
+
+        with pytest.raises(UnknownSequenceError):
+            await main.dispatch("custom-000000000000", 5)
+        mock_redis.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_engine_allows_higher_indices(self, client):
+        response = await client.post("/values", json={"index": 41, "sequence": "tribonacci"})
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_current_values_filters_by_sequence(self, client, mock_redis):
+        mock_redis.keys.return_value = ["lucas:values.10"]
+        mock_redis.mget.return_value = ["123"]
+
+        response = await client.get("/values/current", params={"sequence": "lucas"})
+        assert response.json() == {"10": "123"}
+        mock_redis.keys.assert_called_once_with("lucas:values.*")
+
+
+class TestWarmupEndpoints:
+    """Test the warm-up admin endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_start_warmup(self, admin_client):
+        with patch('main.run_warmup', new=AsyncMock()) as run_warmup:
+            response = await admin_client.post("/admin/warmup", json={"start": 0, "end": 40})
+
+        assert response.status_code == 200
+        assert response.json() == {"started": True, "sequence": "fib", "start": 0, "end": 40}
+        run_warmup.assert_called_once_with("fib", 0, 40)
+
+    @pytest.mark.asyncio
+    async def test_start_warmup_caps_fib_like_submit(self, admin_client):
+        response = await admin_client.post("/admin/warmup", json={"start": 0, "end": 41})
+        assert response.status_code == 422
+        assert response.json()["detail"] == "Index too high (max 40)"
+
+        with patch('main.run_warmup', new=AsyncMock()):
+            response = await admin_client.post("/admin/warmup", json={"start": 0, "end": 41, "sequence": "lucas"})
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_startup_range_capped(self, admin_client):
+        import main
+        with patch('main.warm_up', new=AsyncMock(return_value=0)) as warm_up:
+            await main.run_warmup("fib", 0, 1000)
+            await main.run_warmup("fib", 50, 1000)
+
+        warm_up.assert_called_once()
+        assert warm_up.call_args.args[2:4] == (0, 40)
+
+    @pytest.mark.asyncio
+    async def test_start_warmup_rejects_bad_range(self, admin_client):
+        response = await admin_client.post("/admin/warmup", json={"start": 10, "end": 5})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_warmup_progress(self, admin_client, mock_redis):
+        mock_redis.hgetall = AsyncMock(return_value={"fib:0-1000": "501"})
+
+        response = await admin_client.get("/admin/warmup")
+        assert response.json() == {"fib:0-1000": 501}
+
+
+class TestResultCache:
+    """Test the in-process cache and its invalidation."""
+
+    @pytest.fixture
+    def result_cache(self):
+        import main
+        cache = ByteLRU(1024 * 1024)
+        main.result_cache = cache
+        yield cache
+        main.result_cache = None
+
+    @pytest.mark.asyncio
+    async def test_current_values_served_from_cache(self, client, mock_redis, result_cache):
+        mock_redis.keys.return_value = ["values.1"]
+        mock_redis.mget.return_value = ["1"]
+
+        first = await client.get("/values/current")
+        second = await client.get("/values/current")
+
+        assert first.json() == second.json() == {"1": "1"}
+        assert first.headers["vary"] == second.headers["vary"] == "Accept"
+        assert mock_redis.keys.call_count == 1
+        assert result_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_computed_notification_invalidates_listing(self, client, mock_redis, result_cache):
+        import main
+        mock_redis.keys.return_value = ["values.1"]
+        mock_redis.mget.return_value = ["1"]
+        await client.get("/values/current")
+
+        main.handle_invalidation("computed", "values.5")
+        mock_redis.keys.return_value = ["values.1", "values.5"]
+        mock_redis.mget.return_value = ["1", "8"]
+
+        response = await client.get("/values/current")
+        assert response.json() == {"1": "1", "5": "8"}
+
+    @pytest.mark.asyncio
+    async def test_insert_notification_invalidates_index_list(self, client, mock_pg_pool, result_cache):
+        import main
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchval.return_value = "[1]"
+        await client.get("/values/all")
+
+        main.handle_invalidation("insert", "5")
+        mock_conn.fetchval.return_value = "[1, 5]"
+
+        response = await client.get("/values/all")
+        assert response.json() == [1, 5]
+
+    @pytest.mark.asyncio
+    async def test_submit_invalidates_own_index_list(self, client, mock_pg_pool, result_cache):
+        mock_conn = mock_pg_pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetchval.return_value = "[1]"
+        await client.get("/values/all")
+
+        # No notification arrives; the POST alone must drop the cached listing
+        await client.post("/values", json={"index": 5})
+        mock_conn.fetchval.return_value = "[1, 5]"
+
+        response = await client.get("/values/all")
+        assert response.json() == [1, 5]
+
+    @pytest.mark.asyncio
+    async def test_value_cached_after_first_read(self, client, mock_redis, result_cache):
+        mock_redis.get.return_value = "12345"
+
+        await client.get("/values/5000", params={"sequence": "lucas"})
+        response = await client.get("/values/5000", params={"sequence": "lucas"})
+
+        assert response.text == "12345"
+        mock_redis.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_stats(self, client, result_cache):
+        response = await client.get("/cache/stats")
+        data = response.json()
+        assert data["enabled"] is True
+        assert {"hits", "misses", "evictions"} <= data.keys()
+
+    @pytest.mark.asyncio
+    async def test_cache_stats_disabled(self, client):
+        response = await client.get("/cache/stats")
+        assert response.json() == {"enabled": False}
+
+
 # Health Check Tests
 @pytest.mark.asyncio
 async def test_health_check_all_healthy(client, mock_redis, mock_pg_pool):
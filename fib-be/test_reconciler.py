@@ -0,0 +1,164 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from reconciler import RateLimiter, reconcile
+from recurrence import UnknownSequenceError
+
+
+@pytest.fixture
+def make_pg_pool(pool_for):
+    def make(indices):
+        """Mock pool whose keyset query pages through the given (sequence, number) rows."""
+        rows = sorted(row if isinstance(row, tuple) else ("fib", row) for row in indices)
+
+        async def fetch(query, sequence, number, limit):
+            page = [row for row in rows if row > (sequence, number)][:limit]
+            return [{"sequence": s, "number": n} for s, n in page]
+
+        conn = MagicMock()
+        conn.fetch = AsyncMock(side_effect=fetch)
+        return pool_for(conn)
+    return make
+
+
+@pytest.fixture
+def make_redis(locking_redis):
+    def make(exists, lock_acquired=True):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=exists)
+
+        client = locking_redis(lock_acquired)
+        client.pipeline.return_value = pipe
+        return client
+    return make
+
+
+class TestReconcile:
+    """Test re-enqueueing of indices without computed values."""
+
+    @pytest.mark.asyncio
+    async def test_requeues_only_missing(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 5, 10])
+        redis_client = make_redis([[1, 0, 0]])
+        dispatch = AsyncMock()
+
+        requeued = await reconcile(pg_pool, redis_client, dispatch, rate=0)
+
+        assert requeued == 2
+        dispatched = [c.args for c in dispatch.call_args_list]
+        assert dispatched == [("fib", 5), ("fib", 10)]
+        # Lock released at the end
+        assert redis_client.eval.call_args.args[2] == "reconcile.lock"
+
+    @pytest.mark.asyncio
+    async def test_checks_sequence_qualified_keys(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([("fib", 5), ("lucas", 5)])
+        redis_client = make_redis([[1, 0]])
+        dispatch = AsyncMock()
+
+        await reconcile(pg_pool, redis_client, dispatch, rate=0)
+
+        pipe = redis_client.pipeline.return_value
+        assert [c.args[0] for c in pipe.exists.call_args_list] == ["values.5", "lucas:values.5"]
+        dispatch.assert_called_once_with("lucas", 5)
+
+    @pytest.mark.asyncio
+    async def test_checks_in_batches(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 2, 3])
+        redis_client = make_redis([[1, 1], [0]])
+        dispatch = AsyncMock()
+
+        requeued = await reconcile(pg_pool, redis_client, dispatch, batch_size=2, rate=0)
+
+        assert requeued == 1
+        dispatch.assert_called_once_with("fib", 3)
+
+    @pytest.mark.asyncio
+    async def test_skips_unknown_sequences(self, make_pg_pool, make_redis, capsys):
+        pg_pool = make_pg_pool([("custom-abc", 1), ("custom-abc", 2), ("lucas", 3)])
+        redis_client = make_redis([[0, 0, 0]])
+        calls = []
+
+        async def dispatch(sequence, index):
+            calls.append((sequence, index))
+            if sequence == "custom-abc":
+                raise UnknownSequenceError(sequence)
+
+        requeued = await reconcile(pg_pool, redis_client, dispatch, rate=0)
+
+        assert requeued == 1
+        # Looked up once, then skipped for the rest of the run
+        assert calls == [("custom-abc", 1), ("lucas", 3)]
+        assert "skipped 2 indices of unknown sequence custom-abc" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_releases_connection_before_dispatching(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 2])
+        redis_client = make_redis([[0, 0]])
+        held = []
+
+        async def dispatch(sequence, index):
+            held.append(pg_pool.acquire.return_value.__aexit__.await_count
+                        == pg_pool.acquire.return_value.__aenter__.await_count)
+
+        await reconcile(pg_pool, redis_client, dispatch, rate=0)
+
+        assert held == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_renews_lock_between_batches(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 2, 3])
+        redis_client = make_redis([[1, 1], [1]])
+
+        await reconcile(pg_pool, redis_client, AsyncMock(), batch_size=2, lock_ttl=60, rate=0)
+
+        renewals = [c.args for c in redis_client.eval.call_args_list if len(c.args) == 5]
+        assert len(renewals) == 1
+        assert renewals[0][2:] == ("reconcile.lock", redis_client.set.call_args.args[1], 60)
+
+    @pytest.mark.asyncio
+    async def test_stops_when_lock_is_lost(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 2, 3])
+        redis_client = make_redis([[0, 0], [0]])
+        redis_client.eval = AsyncMock(return_value=0)
+        dispatch = AsyncMock()
+
+        requeued = await reconcile(pg_pool, redis_client, dispatch, batch_size=2, rate=0)
+
+        assert requeued == 2
+        assert pg_pool.acquire.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_skips_values_in_cold_store(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1, 5])
+        redis_client = make_redis([[0, 0]])
+        dispatch = AsyncMock()
+
+        requeued = await reconcile(pg_pool, redis_client, dispatch, cold_store={"values.5"}, rate=0)
+
+        assert requeued == 1
+        dispatch.assert_called_once_with("fib", 1)
+
+    @pytest.mark.asyncio
+    async def test_skips_when_another_replica_holds_lock(self, make_pg_pool, make_redis):
+        pg_pool = make_pg_pool([1])
+        redis_client = make_redis([[0]], lock_acquired=False)
+        dispatch = AsyncMock()
+
+        assert await reconcile(pg_pool, redis_client, dispatch) == 0
+        dispatch.assert_not_called()
+        pg_pool.acquire.assert_not_called()
+
+
+class TestRateLimiter:
+    """Test spacing of re-enqueued jobs."""
+
+    @pytest.mark.asyncio
+    async def test_spaces_calls(self):
+        import time
+        limiter = RateLimiter(rate=100)
+
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.wait()
+
+        assert time.monotonic() - start >= 0.04
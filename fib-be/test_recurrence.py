@@ -0,0 +1,71 @@
+import pytest
+import sys
+
+from recurrence import SEQUENCES, LinearRecurrence, custom, parse_value_key, to_decimal, value_key
+
+
+def naive(recurrence, n):
+    terms = list(recurrence.initial)
+    while len(terms) <= n:
+        terms.append(recurrence.step(terms[-recurrence.order:]))
+    return terms[n]
+
+
+class TestLinearRecurrence:
+    """Test the Kitamasa evaluation against step-by-step iteration."""
+
+    def test_fib_matches_worker_convention(self):
+        fib = SEQUENCES["fib"]
+        assert [fib.nth(n) for n in range(8)] == [1, 1, 2, 3, 5, 8, 13, 21]
+
+    def test_lucas_and_tribonacci(self):
+        assert [SEQUENCES["lucas"].nth(n) for n in range(6)] == [2, 1, 3, 4, 7, 11]
+        assert [SEQUENCES["tribonacci"].nth(n) for n in range(8)] == [0, 0, 1, 1, 2, 4, 7, 13]
+
+    @pytest.mark.parametrize("recurrence", [
+        *SEQUENCES.values(),
+        LinearRecurrence("single", [3], [2]),
+        LinearRecurrence("mixed", [2, -1, 5, 7], [1, 0, 3, 9]),
+    ], ids=lambda r: r.name)
+    def test_matches_iteration(self, recurrence):
+        assert all(recurrence.nth(n) == naive(recurrence, n) for n in range(150))
+
+    def test_large_index(self):
+        fib = SEQUENCES["fib"]
+        assert fib.nth(10000) == naive(fib, 10000)
+
+    def test_window(self):
+        assert SEQUENCES["tribonacci"].window(4) == [2, 4, 7]
+
+    def test_invalid_definitions(self):
+        with pytest.raises(ValueError):
+            LinearRecurrence("bad", [1, 1], [1])
+        with pytest.raises(ValueError):
+            custom([1] * 11, [1] * 11)
+        with pytest.raises(ValueError):
+            custom([5000], [1])
+        with pytest.raises(ValueError):
+            custom([1, 1], [0, 10 ** 10])
+
+    def test_to_decimal_past_digit_limit(self):
+        value = SEQUENCES["fib"].nth(30000)
+        assert len(to_decimal(value)) > sys.get_int_max_str_digits() > 0
+        assert int(to_decimal(value)[:50]) == value // 10 ** (len(to_decimal(value)) - 50)
+        assert to_decimal(-(10 ** 5000 + 7)) == "-1" + "0" * 4999 + "7"
+        assert to_decimal(0) == "0"
+
+
+class TestKeys:
+    """Test sequence-qualified value keys."""
+
+    def test_fib_keeps_worker_keys(self):
+        assert value_key("fib", 10) == "values.10"
+        assert parse_value_key("values.10") == ("fib", "10")
+
+    def test_other_sequences_are_prefixed(self):
+        assert value_key("lucas", 10) == "lucas:values.10"
+        assert parse_value_key("lucas:values.10") == ("lucas", "10")
+
+    def test_custom_names_are_stable(self):
+        assert custom([1, 2], [0, 1]).name == custom([1, 2], [0, 1]).name
+        assert custom([1, 2], [0, 1]).name != custom([2, 1], [0, 1]).name
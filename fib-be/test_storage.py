@@ -0,0 +1,141 @@
+import pytest
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+from storage import ColdStore, spill_cold_values
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ColdStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+class TestColdStore:
+    """Test the append-only, memory-mapped value store."""
+
+    def test_put_and_get(self, store):
+        store.put("values.10", "55")
+        store.put("values.20", "10946")
+
+        assert bytes(store.get("values.10")) == b"55"
+        assert bytes(store.get("values.20")) == b"10946"
+        assert store.get("values.30") is None
+        assert "values.10" in store
+        assert len(store) == 2
+
+    def test_later_write_wins(self, store):
+        store.put("values.10", "1")
+        store.put("values.10", "55")
+
+        assert bytes(store.get("values.10")) == b"55"
+        assert len(store) == 1
+
+    def test_reopen_reads_index(self, store, tmp_path):
+        store.put("values.10", "55")
+
+        reopened = ColdStore(str(tmp_path))
+        try:
+            assert bytes(reopened.get("values.10")) == b"55"
+        finally:
+            reopened.close()
+
+    def test_sees_writes_from_other_handle(self, store, tmp_path):
+        other = ColdStore(str(tmp_path))
+        try:
+            other.put("values.10", "55")
+            assert bytes(store.get("values.10")) == b"55"
+        finally:
+            other.close()
+
+    def test_put_many(self, store, tmp_path):
+        store.put_many([("values.1", "1"), ("lucas:values.2", b"3")])
+        reopened = ColdStore(str(tmp_path))
+        try:
+            assert bytes(reopened.get("values.1")) == b"1"
+            assert bytes(reopened.get("lucas:values.2")) == b"3"
+        finally:
+            reopened.close()
+
+    def test_iter_chunks(self, store):
+        value = "1234567890" * 10
+        store.put("values.99", value)
+
+        chunks = list(store.iter_chunks("values.99", chunk_size=32))
+        assert all(isinstance(chunk, memoryview) for chunk in chunks)
+        assert b"".join(chunks).decode() == value
+        assert len(chunks) == 4
+
+
+class TestSpillColdValues:
+    """Test moving values out of Redis into the cold store."""
+
+    @pytest.mark.asyncio
+    async def test_spills_large_and_idle_values(self, store):
+        async def scan_iter(**kwargs):
+            for key in ["values.1", "values.2", "values.3"]:
+                yield key
+
+        pipe = MagicMock()
+        # (idletime, memory usage) per key: small+fresh, large, idle
+        pipe.execute = AsyncMock(return_value=[0, 1, 0, 5000, 7200, 2])
+
+        redis_client = MagicMock()
+        redis_client.scan_iter = scan_iter
+        redis_client.pipeline.return_value = pipe
+        redis_client.mget = AsyncMock(return_value=["big", "42"])
+        redis_client.delete = AsyncMock()
+
+        spilled = await spill_cold_values(redis_client, store, size_threshold=4096, idle_seconds=3600)
+
+        assert spilled == 2
+        redis_client.mget.assert_called_once_with(["values.2", "values.3"])
+        redis_client.delete.assert_called_once_with("values.2", "values.3")
+        assert bytes(store.get("values.3")) == b"42"
+        assert "values.1" not in store
+
+    @pytest.mark.asyncio
+    async def test_writes_off_the_event_loop(self, store):
+        async def scan_iter(**kwargs):
+            yield "values.2"
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[0, 5000])
+        redis_client = MagicMock()
+        redis_client.scan_iter = scan_iter
+        redis_client.pipeline.return_value = pipe
+        redis_client.mget = AsyncMock(return_value=["big"])
+        redis_client.delete = AsyncMock()
+        threads = []
+        put_many = store.put_many
+
+        def recording_put_many(items):
+            threads.append(threading.current_thread())
+            put_many(items)
+
+        with patch.object(store, "put_many", side_effect=recording_put_many):
+            await spill_cold_values(redis_client, store, size_threshold=4096, idle_seconds=3600)
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert bytes(store.get("values.2")) == b"big"
+
+    @pytest.mark.asyncio
+    async def test_does_not_touch_small_fresh_keys(self, store):
+        async def scan_iter(**kwargs):
+            yield "values.1"
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[10, 60])
+
+        redis_client = MagicMock()
+        redis_client.scan_iter = scan_iter
+        redis_client.pipeline.return_value = pipe
+        redis_client.mget = AsyncMock()
+        redis_client.delete = AsyncMock()
+
+        assert await spill_cold_values(redis_client, store, size_threshold=4096, idle_seconds=3600) == 0
+
+        # Only commands that leave the LRU clock alone may be pipelined for kept keys
+        pipelined = {name for name, _, _ in pipe.method_calls if name != "execute"}
+        assert pipelined == {"object", "memory_usage"}
+        redis_client.mget.assert_not_called()
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from recurrence import SEQUENCES
+from warmup import PROGRESS_KEY, parse_range, warm_up
+
+
+@pytest.fixture
+def make_redis(locking_redis):
+    def make(saved=None, lock_acquired=True):
+        """Mock client recording the values written by each pipeline."""
+        pipes = []
+
+        def pipeline(transaction):
+            pipe = MagicMock()
+            pipe.execute = AsyncMock()
+            pipes.append(pipe)
+            return pipe
+
+        client = locking_redis(lock_acquired)
+        client.hget = AsyncMock(return_value=saved)
+        client.pipeline = pipeline
+        client.pipes = pipes
+        return client
+    return make
+
+
+def written_values(client):
+    return {
+        call.args[0]: call.args[1]
+        for pipe in client.pipes
+        for call in pipe.set.call_args_list
+    }
+
+
+class TestWarmUp:
+    """Test incremental, resumable warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_writes_range_in_batches(self, make_redis):
+        client = make_redis()
+        fib = SEQUENCES["fib"]
+
+        written = await warm_up(client, fib, 0, 9, batch_size=4)
+
+        assert written == 10
+        assert len(client.pipes) == 3
+        values = written_values(client)
+        assert values == {f"values.{n}": str(fib.nth(n)) for n in range(10)}
+        # Progress is saved with each batch
+        progress = [pipe.hset.call_args.args for pipe in client.pipes]
+        assert progress == [(PROGRESS_KEY, "fib:0-9", 4), (PROGRESS_KEY, "fib:0-9", 8),
+                            (PROGRESS_KEY, "fib:0-9", 10)]
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_saved_progress(self, make_redis):
+        client = make_redis(saved="95")
+        tribonacci = SEQUENCES["tribonacci"]
+
+        written = await warm_up(client, tribonacci, 0, 99)
+
+        assert written == 5
+        values = written_values(client)
+        assert values == {f"tribonacci:values.{n}": str(tribonacci.nth(n)) for n in range(95, 100)}
+
+    @pytest.mark.asyncio
+    async def test_finished_range_is_skipped(self, make_redis):
+        client = make_redis(saved="100")
+
+        assert await warm_up(client, SEQUENCES["fib"], 0, 99) == 0
+        assert client.pipes == []
+
+    @pytest.mark.asyncio
+    async def test_skips_when_range_is_locked(self, make_redis):
+        client = make_redis(lock_acquired=False)
+
+        assert await warm_up(client, SEQUENCES["fib"], 0, 99) == 0
+        client.hget.assert_not_called()
+
+
+    @pytest.mark.asyncio
+    async def test_stops_when_lock_is_lost(self, make_redis):
+        client = make_redis()
+        client.eval = AsyncMock(return_value=0)
+
+        written = await warm_up(client, SEQUENCES["lucas"], 0, 9, batch_size=4)
+
+        assert written == 4
+        assert len(client.pipes) == 1
+        renewal = client.eval.call_args_list[0].args
+        assert renewal[2:] == ("warmup.lock.lucas:0-9", client.set.call_args.args[1], 3600)
+
+
+class TestParseRange:
+    """Test WARMUP_RANGE parsing."""
+
+    def test_parse(self):
+        assert parse_range("") is None
+        assert parse_range("0-1000") == (0, 1000)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_range("10-5")
@@ -0,0 +1,79 @@
+"""Pre-fill Redis with a range of values so the first reads after a deploy hit.
+
+Terms are produced incrementally: each one comes from the previous k terms,
+so the whole range costs one addition per index instead of one computation
+from scratch. Each batch is written in a single MULTI/EXEC pipeline together
+with the next index to compute. An interrupted run resumes from there, after
+jumping straight to that window with the recurrence engine.
+"""
+import asyncio
+
+from coordination import redis_lock
+from recurrence import LinearRecurrence, to_decimal, value_key
+
+
+PROGRESS_KEY = "warmup.progress"
+
+
+def progress_field(sequence: str, start: int, end: int) -> str:
+    return f"{sequence}:{start}-{end}"
+
+
+def _compute_batch(recurrence: LinearRecurrence, window: list[int], first: int, last: int):
+    """Return ([(index, value), ...] for first..last, window advanced past last)."""
+    batch = []
+    for index in range(first, last + 1):
+        batch.append((index, to_decimal(window[0])))
+        window = window[1:] + [recurrence.step(window)]
+    return batch, window
+
+
+async def warm_up(redis_client, recurrence: LinearRecurrence, start: int, end: int,
+                  batch_size: int = 500, lock_ttl: int = 3600) -> int:
+    """Write values for start..end (inclusive), resuming a previous run if any.
+
+    Returns the number of values written, or 0 if another process is already
+    warming the same range. The lock is renewed after every batch; a run that
+    loses it stops.
+    """
+    field = progress_field(recurrence.name, start, end)
+    async with redis_lock(redis_client, f"warmup.lock.{field}", lock_ttl) as lock:
+        if not lock:
+            return 0
+
+        saved = await redis_client.hget(PROGRESS_KEY, field)
+        next_index = int(saved) if saved is not None else start
+        if next_index > end:
+            return 0
+
+        window = await asyncio.to_thread(recurrence.window, next_index)
+        written = 0
+        while next_index <= end:
+            last = min(end, next_index + batch_size - 1)
+            batch, window = await asyncio.to_thread(_compute_batch, recurrence, window, next_index, last)
+
+            pipe = redis_client.pipeline(transaction=True)
+            for index, value in batch:
+                pipe.set(value_key(recurrence.name, index), value)
+            pipe.hset(PROGRESS_KEY, field, last + 1)
+            pipe.publish("computed", "*")
+            await pipe.execute()
+
+            written += len(batch)
+            next_index = last + 1
+            # Progress is saved, so whoever takes over a lost lock resumes from here
+            if next_index <= end and not await lock.renew():
+                print(f"Warm-up of {field} lost its lock; stopping")
+                break
+        return written
+
+
+def parse_range(spec: str) -> tuple[int, int] | None:
+    """Parse "start-end" (e.g. "0-1000"); empty means no range."""
+    if not spec:
+        return None
+    start, _, end = spec.partition("-")
+    start, end = int(start), int(end)
+    if start < 0 or end < start:
+        raise ValueError(f"Invalid warm-up range: {spec}")
+    return start, end
@@ -33,8 +33,8 @@ const healthServer = http.createServer((req, res) => {
   }
 });
 
-healthServer.listen(5001, () => {
-  console.log('Health check server listening on port 5001');
+healthServer.listen(keys.healthPort, () => {
+  console.log(`Health check server listening on port ${keys.healthPort}`);
 });
 
 (async () => {
@@ -47,6 +47,8 @@ healthServer.listen(5001, () => {
       const index = parseInt(message);
       const result = fib(index);
       await redisClient.set(`values.${index}`, result.toString());
+      // Lets API processes drop their cached listings
+      await redisClient.publish('computed', `values.${index}`);
       console.log(`Calculated fib(${index}) = ${result}`);
     });
 
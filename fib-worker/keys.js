@@ -1,4 +1,5 @@
 module.exports = {
   redisHost: process.env.REDIS_HOST,
   redisPort: process.env.REDIS_PORT,
+  healthPort: process.env.HEALTH_PORT || 5001,
 };
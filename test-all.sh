@@ -18,7 +18,7 @@ echo ""
 echo "🐍 Backend Tests (FastAPI + pytest)..."
 cd fib-be
 pip install -q -r requirements.txt
-python -m pytest test_main.py -v
+python -m pytest -v
 cd ..
 
 # Worker tests
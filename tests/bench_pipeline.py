@@ -0,0 +1,329 @@
+"""
+End-to-end soak and scaling benchmark: POST /values -> worker -> /values/current.
+
+Measures the time from submitting an index until its value shows up in
+/values/current, sweeping submit rate, index band and worker count. For each
+combination it reports latency percentiles, throughput, lost jobs (never
+visible within --timeout), and memory growth of the API, the workers and
+Redis over the run.
+
+Needs a local Redis and Postgres (REDIS_HOST/REDIS_PORT and PG* env vars, as
+for the API). By default the benchmark starts the API (uvicorn) and the
+workers (node fib-worker/index.js) itself. Use --api-url to target a running
+API, and --worker python to use an in-process stand-in for the Node worker
+(same algorithm and keys) when Node is not available.
+
+The fib bands (at most index 40) go through the worker. Every fib value costs
+the worker next to nothing, so they measure queueing and pub/sub, not value
+size. The `lucas` band goes through the API's recurrence engine with indices
+up to 10000 (the default RECURRENCE_MAX_INDEX), so values run to thousands
+of digits. That is the band that shows the cost of size.
+
+Each index has at most one job in flight. Before a job is submitted, its
+value key is deleted and a `computed` notification is published so API caches
+drop the old value. Because that destroys computed values, --api-url is
+refused unless --destructive is also given. This is not collected by pytest
+(python_files = test_*.py).
+
+Run with:
+    python tests/bench_pipeline.py --rates 5,20,50 --workers 1,2,4 --duration 30
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import redis
+import requests
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Band name -> (sequence, indices)
+INDEX_BANDS = {
+    "small": ("fib", range(0, 14)),
+    "medium": ("fib", range(14, 28)),
+    "large": ("fib", range(28, 41)),
+    "lucas": ("lucas", range(5000, 10001)),
+}
+
+
+def rss_kb(pid: int) -> int | None:
+    """Resident set size of a process in KiB (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(sorted_values: list[float], pct: float) -> float | None:
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def stand_in_worker(redis_host: str, redis_port: int):
+    """Python equivalent of fib-worker/index.js."""
+    client = redis.Redis(host=redis_host, port=redis_port, decode_responses=True)
+    sub = client.pubsub()
+    sub.subscribe("insert")
+    for message in sub.listen():
+        if message["type"] != "message":
+            continue
+        index = int(message["data"])
+        a, b = 1, 1
+        for _ in range(2, index + 1):
+            a, b = b, a + b
+        client.set(f"values.{index}", str(b))
+        client.publish("computed", f"values.{index}")
+
+
+class Stack:
+    """The API and worker processes under test."""
+
+    def __init__(self, args, redis_client):
+        self.args = args
+        self.redis = redis_client
+        self.api = None
+        self.api_url = args.api_url
+        self.workers = []
+
+    def start_api(self):
+        if self.api_url:
+            return
+        port = self.args.api_port
+        env = {**os.environ, "RECONCILE_INTERVAL": "0"}
+        self.api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=os.path.join(ROOT, "fib-be"), env=env
+        )
+        self.api_url = f"http://127.0.0.1:{port}"
+        wait_until(lambda: self._api_healthy(), 30, "API never became healthy")
+
+    def _api_healthy(self) -> bool:
+        try:
+            return requests.get(f"{self.api_url}/health", timeout=1).json()["status"] == "healthy"
+        except requests.RequestException:
+            return False
+
+    def start_workers(self, count: int):
+        self.stop_workers()
+        if self.args.worker == "external":
+            return
+        baseline = self._insert_subscribers()
+        for i in range(count):
+            if self.args.worker == "node":
+                env = {**os.environ, "HEALTH_PORT": str(self.args.health_port + i)}
+                proc = subprocess.Popen(
+                    ["node", "index.js"], cwd=os.path.join(ROOT, "fib-worker"), env=env,
+                    stdout=subprocess.DEVNULL
+                )
+            else:
+                proc = multiprocessing.Process(
+                    target=stand_in_worker, args=(self.args.redis_host, self.args.redis_port), daemon=True
+                )
+                proc.start()
+            self.workers.append(proc)
+        wait_until(lambda: self._insert_subscribers() >= baseline + count, 30,
+                   "Workers never subscribed to insert")
+
+    def _insert_subscribers(self) -> int:
+        return dict(self.redis.pubsub_numsub("insert")).get("insert", 0)
+
+    def stop_workers(self):
+        for proc in self.workers:
+            proc.terminate()
+        for proc in self.workers:
+            if isinstance(proc, multiprocessing.Process):
+                proc.join(5)
+            else:
+                proc.wait(5)
+        self.workers = []
+
+    def memory_kb(self) -> dict:
+        pids = [p.pid for p in self.workers]
+        worker_rss = [rss_kb(pid) for pid in pids]
+        return {
+            "api": rss_kb(self.api.pid) if self.api else None,
+            "workers": sum(worker_rss) if worker_rss and None not in worker_rss else None,
+            "redis": self.redis.info("memory")["used_memory"] // 1024,
+        }
+
+    def stop(self):
+        self.stop_workers()
+        if self.api:
+            self.api.terminate()
+            self.api.wait(10)
+
+
+def wait_until(condition, timeout: float, message: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return
+        time.sleep(0.2)
+    raise RuntimeError(message)
+
+
+def run_phase(stack, redis_client, band, rate, duration, timeout, poll_interval) -> dict:
+    """Submit jobs at `rate` per second for `duration` seconds and track visibility."""
+    sequence, indices = band
+    key_prefix = "" if sequence == "fib" else f"{sequence}:"
+    session = requests.Session()
+    lock = threading.Lock()
+    pending: dict[int, tuple[float, float]] = {}  # index -> (submit started, submit returned)
+    latencies: list[float] = []
+    lost = 0
+    submitted = 0
+    throttled = 0
+    done = threading.Event()
+
+    def poller():
+        nonlocal lost
+        poll_session = requests.Session()
+        while not done.is_set() or pending:
+            poll_started = time.monotonic()
+            try:
+                values = poll_session.get(f"{stack.api_url}/values/current", params={"sequence": sequence},
+                                          timeout=10).json()
+            except requests.RequestException:
+                values = {}
+            now = time.monotonic()
+            with lock:
+                for index, (submitted_at, armed_at) in list(pending.items()):
+                    # Only polls started after the POST returned count, so stale listings can't match
+                    if poll_started >= armed_at and str(index) in values:
+                        latencies.append(now - submitted_at)
+                        del pending[index]
+                    elif now - submitted_at > timeout:
+                        lost += 1
+                        del pending[index]
+            time.sleep(poll_interval)
+
+    poll_thread = threading.Thread(target=poller, daemon=True)
+    poll_thread.start()
+    memory_before = stack.memory_kb()
+
+    started = time.monotonic()
+    interval = 1.0 / rate
+    next_submit = started
+    while time.monotonic() - started < duration:
+        with lock:
+            free = [index for index in indices if index not in pending]
+        if not free:
+            # Every index in the band is in flight; the pipeline is the bottleneck
+            throttled += 1
+            time.sleep(interval)
+            continue
+
+        index = random.choice(free)
+        key = f"{key_prefix}values.{index}"
+        redis_client.delete(key)
+        redis_client.publish("computed", key)
+        submitted_at = time.monotonic()
+        session.post(f"{stack.api_url}/values", json={"index": index, "sequence": sequence},
+                     timeout=10).raise_for_status()
+        with lock:
+            pending[index] = (submitted_at, time.monotonic())
+        submitted += 1
+
+        next_submit += interval
+        time.sleep(max(0.0, next_submit - time.monotonic()))
+
+    submit_seconds = time.monotonic() - started
+    done.set()
+    poll_thread.join(timeout + 5)
+    memory_after = stack.memory_kb()
+
+    latencies.sort()
+
+    def ms(value):
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "submitted": submitted,
+        "completed": len(latencies),
+        "lost": lost,
+        "throttled": throttled,
+        "throughput": round(len(latencies) / submit_seconds, 1),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+        "memory_growth_kb": {
+            name: (memory_after[name] - memory_before[name])
+            if memory_after[name] is not None and memory_before[name] is not None else None
+            for name in memory_before
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", default="5,20,50", help="Submits per second to sweep")
+    parser.add_argument("--bands", default="small,large,lucas", help=f"Index bands: {','.join(INDEX_BANDS)}")
+    parser.add_argument("--workers", default="1,2", help="Worker counts to sweep")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of submitting per combination")
+    parser.add_argument("--timeout", type=float, default=10, help="Seconds before a job counts as lost")
+    parser.add_argument("--poll-interval", type=float, default=0.01)
+    parser.add_argument("--worker", choices=("node", "python", "external"), default="node")
+    parser.add_argument("--api-url", help="Use a running API instead of starting one (needs --destructive)")
+    parser.add_argument("--api-port", type=int, default=18000)
+    parser.add_argument("--health-port", type=int, default=15001, help="First worker health port")
+    parser.add_argument("--redis-host", default=os.getenv("REDIS_HOST", "localhost"))
+    parser.add_argument("--redis-port", type=int, default=int(os.getenv("REDIS_PORT", "6379")))
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--destructive", action="store_true",
+                        help="Allow deleting values.<n> keys behind an API this benchmark did not start")
+    args = parser.parse_args(argv)
+    if args.api_url and not args.destructive:
+        parser.error("--api-url deletes values.<n> keys in that API's Redis; pass --destructive to confirm")
+
+    # The API and node workers started below read these
+    os.environ["REDIS_HOST"] = args.redis_host
+    os.environ["REDIS_PORT"] = str(args.redis_port)
+
+    redis_client = redis.Redis(host=args.redis_host, port=args.redis_port, decode_responses=True)
+    stack = Stack(args, redis_client)
+    results = []
+    try:
+        stack.start_api()
+        header = (f"{'workers':>7} {'band':>6} {'rate':>5} {'sent':>5} {'done':>5} {'lost':>4} "
+                  f"{'thr/s':>6} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7} {'maxms':>7} "
+                  f"{'api+KB':>7} {'wrk+KB':>7} {'redis+KB':>8}")
+        print(header)
+        for workers in [int(w) for w in args.workers.split(",")]:
+            stack.start_workers(workers)
+            for band_name in args.bands.split(","):
+                for rate in [float(r) for r in args.rates.split(",")]:
+                    result = run_phase(stack, redis_client, INDEX_BANDS[band_name], rate,
+                                       args.duration, args.timeout, args.poll_interval)
+                    result.update(workers=workers, band=band_name, rate=rate)
+                    results.append(result)
+                    mem = result["memory_growth_kb"]
+                    print(f"{workers:>7} {band_name:>6} {rate:>5g} {result['submitted']:>5} "
+                          f"{result['completed']:>5} {result['lost']:>4} {result['throughput']:>6} "
+                          f"{result['p50_ms'] or '-':>7} {result['p95_ms'] or '-':>7} "
+                          f"{result['p99_ms'] or '-':>7} {result['max_ms'] or '-':>7} "
+                          f"{mem['api'] if mem['api'] is not None else '-':>7} "
+                          f"{mem['workers'] if mem['workers'] is not None else '-':>7} "
+                          f"{mem['redis']:>8}", flush=True)
+    finally:
+        stack.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()